@@ -0,0 +1,168 @@
+import argparse
+import csv
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import cv2
+import numpy as np
+from frame_source import load_recording, npz_to_directory
+
+COLUMNS = ('recording', 'frame', 't', 'white_y', 'gray_y', 'green_fill', 'progress', 'distance')
+
+def blue_profiles_batch(blue, gray_lower, gray_upper):
+    """
+    Profils par ligne (pixels blancs, pixels gris) d'une pile (N, H, W, 3)
+
+    La pile est vue comme une seule image (N*H, W, 3) : une conversion, un
+    seuillage et une réduction OpenCV pour tout le chunk, résultats identiques
+    à GPOFishingBot.blue_row_profiles frame par frame.
+    """
+    n, h, w, _ = blue.shape
+    flat = np.ascontiguousarray(blue).reshape(n * h, w, 3)
+    gray = cv2.cvtColor(flat, cv2.COLOR_BGR2GRAY)
+    _, white = cv2.threshold(gray, 240, 1, cv2.THRESH_BINARY)
+    dark = cv2.inRange(flat, gray_lower, gray_upper)
+    white_rows = cv2.reduce(white, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).reshape(n, h)
+    gray_rows = cv2.reduce(dark, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).reshape(n, h) // 255
+    return white_rows, gray_rows
+
+def positions_batch(white_rows, gray_rows):
+    """(white_y, gray_y) par frame, -1 si non détecté (même règles que positions_from_profiles)"""
+    counts = white_rows.sum(axis=1, dtype=np.int64)
+    weighted = white_rows.astype(np.int64) @ np.arange(white_rows.shape[1], dtype=np.int64)
+    white_y = np.where(counts * 255 > 50, weighted // np.maximum(counts, 1), -1).astype(np.int32)
+    gray_y = np.argmax(gray_rows, axis=1).astype(np.int32)
+    gray_y[gray_rows.max(axis=1) < 15] = -1
+    return white_y, gray_y
+
+def green_fill_batch(green, columns, green_lower, green_upper):
+    """Hauteur remplie (px) par frame sur les colonnes échantillonnées (mêmes règles que measure_green_fill)"""
+    n, h = green.shape[:2]
+    sampled = np.ascontiguousarray(green[:, :, columns]).reshape(n * h, len(columns), 3)
+    mask = cv2.inRange(cv2.cvtColor(sampled, cv2.COLOR_BGR2HSV), green_lower, green_upper)
+    rows = cv2.reduce(mask, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).reshape(n, h) // 255
+    return np.count_nonzero(rows * 2 > len(columns), axis=1).astype(np.int32)
+
+def analyze_frames(blue, green, settings):
+    """Séries par frame d'un chunk : white_y, gray_y, green_fill, progress (%), distance à la cible (px)"""
+    white_y, gray_y = positions_batch(*blue_profiles_batch(blue, settings['gray_zone_lower'], settings['gray_zone_upper']))
+    height = green.shape[1]
+    columns = np.linspace(2, green.shape[2] - 3, settings['green_sample_count']).astype(np.intp)
+    green_fill = green_fill_batch(green, columns, settings['green_lower'], settings['green_upper'])
+    detected = (white_y >= 0) & (gray_y >= 0)
+    distance = np.where(detected, gray_y - (white_y - settings['target_offset']), np.nan).astype(np.float32)
+    return {'white_y': white_y, 'gray_y': gray_y, 'green_fill': green_fill,
+            'progress': (green_fill / height * 100).astype(np.float32), 'distance': distance}
+
+def bot_settings(bot):
+    """Seuils et réglages de détection d'une GPOFishingBot (transmis aux workers)"""
+    return {'gray_zone_lower': bot.gray_zone_lower, 'gray_zone_upper': bot.gray_zone_upper,
+            'green_lower': bot.green_lower, 'green_upper': bot.green_upper,
+            'green_sample_count': bot.green_sample_count, 'target_offset': bot.target_offset}
+
+# Enregistrements déjà ouverts par ce process (memory-maps : pages partagées entre workers)
+_recordings = {}
+
+def _analyze_chunk(job):
+    index, path, start, stop, settings = job
+    if path not in _recordings:
+        _recordings[path] = load_recording(path)
+    blue, green, timestamps = _recordings[path]
+    series = analyze_frames(blue[start:stop], green[start:stop], settings)
+    series['recording'] = np.full(stop - start, index, np.int16)
+    series['frame'] = np.arange(start, stop, dtype=np.int32)
+    series['t'] = np.asarray(timestamps[start:stop], np.float64)
+    return series
+
+def analyze(paths, settings, chunk=512, workers=None, workdir=None):
+    """
+    Analyse des enregistrements par chunks de `chunk` frames sur un pool de processus
+
+    Les .npz sont d'abord décompressés une fois en dossiers memory-mappés
+    temporaires (workdir, sinon dossier temporaire supprimé à la fin) : les
+    workers lisent les mêmes pages au lieu de décompresser chacun tout le fichier.
+    Retourne (colonnes, durée enregistrée totale en s)
+    """
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        jobs = []
+        recorded = 0.0
+        for index, path in enumerate(paths):
+            if not os.path.isdir(path):
+                path = npz_to_directory(path, os.path.join(tmp, f"recording_{index}"))
+            _, _, timestamps = load_recording(path)
+            count = len(timestamps)
+            if count > 1:
+                recorded += float(timestamps[-1] - timestamps[0])
+            jobs.extend((index, path, start, min(start + chunk, count), settings) for start in range(0, count, chunk))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_analyze_chunk, jobs))
+    if not chunks:
+        return {name: np.zeros(0) for name in COLUMNS}, recorded
+    return {name: np.concatenate([c[name] for c in chunks]) for name in COLUMNS}, recorded
+
+def save_columns(path, columns, recordings):
+    """Écrit les séries : .npz (une colonne par tableau), .parquet (pyarrow requis) ou .csv"""
+    if path.endswith('.parquet'):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("❌ pyarrow is required for .parquet output (use .npz or .csv)")
+        table = pa.table({name: columns[name] for name in COLUMNS})
+        pq.write_table(table.replace_schema_metadata({'recordings': '\n'.join(recordings)}), path)
+    elif path.endswith('.csv'):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            writer.writerows(zip(*(columns[name].tolist() for name in COLUMNS)))
+    else:
+        np.savez(path, recordings=np.array(recordings), **columns)
+
+def check_against_bot(bot, path, count):
+    """Compare les `count` premières frames avec les détecteurs frame par frame du bot ; (écarts, frames/s du bot)"""
+    blue, green, _ = load_recording(path)
+    count = min(count, len(blue))
+    series = analyze_frames(blue[:count], green[:count], bot_settings(bot))
+    mismatches = 0
+    start = time.perf_counter()
+    for i in range(count):
+        white_y, gray_y = bot.detect_blue_frame(np.ascontiguousarray(blue[i]))
+        fill = bot.measure_green_fill(np.ascontiguousarray(green[i]))
+        expected = (-1 if white_y is None else white_y, -1 if gray_y is None else gray_y, fill)
+        if expected != (series['white_y'][i], series['gray_y'][i], series['green_fill'][i]):
+            mismatches += 1
+    elapsed = time.perf_counter() - start
+    return mismatches, count / elapsed if elapsed > 0 else 0.0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch detection over recorded sessions (vectorized, multi-process)")
+    parser.add_argument('recordings', nargs='+', help="Recording directories (memory-mapped) or .npz files")
+    parser.add_argument('--out', default='analysis.npz', help="Output file: .npz, .csv or .parquet")
+    parser.add_argument('--chunk', type=int, default=512, help="Frames per task")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: all cores)")
+    parser.add_argument('--workdir', help="Where .npz recordings are unpacked for memory-mapping (default: system temp dir)")
+    parser.add_argument('--check', type=int, default=0, metavar='N', help="Check the first N frames of each recording against the per-frame detectors")
+    args = parser.parse_args()
+
+    from fishing_bot import GPOFishingBot
+    bot = GPOFishingBot()
+    settings = bot_settings(bot)
+
+    start = time.perf_counter()
+    columns, recorded = analyze(args.recordings, settings, args.chunk, args.workers, args.workdir)
+    elapsed = time.perf_counter() - start
+    save_columns(args.out, columns, [os.path.abspath(p) for p in args.recordings])
+
+    frames = len(columns['frame'])
+    detected = np.count_nonzero((columns['white_y'] >= 0) & (columns['gray_y'] >= 0))
+    print(f"\n📊 {frames} frames from {len(args.recordings)} recording(s) in {elapsed:.2f}s "
+          f"({frames / elapsed:.0f} frames/s, x{recorded / elapsed:.0f} real time)")
+    print(f"   Bar detected on {detected / max(1, frames) * 100:.1f}% of frames")
+    print(f"💾 Series saved to {args.out}")
+
+    if args.check:
+        for path in args.recordings:
+            mismatches, bot_fps = check_against_bot(bot, path, args.check)
+            status = "✅" if mismatches == 0 else "❌"
+            print(f"{status} {path}: {mismatches} mismatches vs per-frame detectors | per-frame loop {bot_fps:.0f} frames/s")
@@ -0,0 +1,298 @@
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+import numpy as np
+from fishing_bot import GPOFishingBot
+from frame_source import FrameSource
+from loop_pacer import MINIGAME
+
+# Couleurs BGR proches du jeu
+BLUE_BAR_COLOR = (235, 160, 60)
+GRAY_ZONE_COLOR = (25, 25, 25)
+WHITE_MARKER_COLOR = (255, 255, 255)
+GREEN_FILL_COLOR = (60, 200, 60)
+GREEN_EMPTY_COLOR = (40, 40, 40)
+
+def make_blue_frame(gray_y, white_y, width=40, height=400, gray_height=20, marker_height=4):
+    """Frame bleue synthétique : fond bleu, zone grise à gray_y, marqueur blanc centré sur white_y"""
+    frame = np.empty((height, width, 3), np.uint8)
+    frame[:] = BLUE_BAR_COLOR
+    if gray_y is not None:
+        frame[gray_y:gray_y + gray_height, 3:width - 3] = GRAY_ZONE_COLOR
+    if white_y is not None:
+        top = max(0, white_y - marker_height // 2)
+        frame[top:top + marker_height, 5:width - 5] = WHITE_MARKER_COLOR
+    return frame
+
+def make_green_frame(progress, width=22, height=319):
+    """Frame verte synthétique remplie par le bas à progress %"""
+    frame = np.empty((height, width, 3), np.uint8)
+    frame[:] = GREEN_EMPTY_COLOR
+    fill = int(round(height * progress / 100.0))
+    if fill:
+        frame[height - fill:] = GREEN_FILL_COLOR
+    return frame
+
+def make_scenarios(count, seed=0, height=400):
+    """Positions aléatoires (reproductibles) de zone grise, marqueur et progression"""
+    rng = np.random.default_rng(seed)
+    scenarios = []
+    for _ in range(count):
+        white_y = int(rng.integers(20, height - 20))
+        gray_y = int(np.clip(white_y - 40 + rng.integers(-120, 160), 0, height - 20))
+        progress = float(rng.uniform(0, 100))
+        scenarios.append((gray_y, white_y, progress))
+    return scenarios
+
+def make_trajectory(count, seed=0, height=400):
+    """Positions qui bougent de quelques pixels par frame (suivi incrémental)"""
+    rng = np.random.default_rng(seed)
+    white_y, gray_y = height / 2, height / 2 - 40
+    scenarios = []
+    for _ in range(count):
+        white_y = float(np.clip(white_y + rng.normal(0, 3), 20, height - 20))
+        gray_y = float(np.clip(gray_y + rng.normal(0, 4), 0, height - 20))
+        scenarios.append((int(gray_y), int(white_y), 50.0))
+    return scenarios
+
+class SyntheticFrameSource(FrameSource):
+    """Boucle sur des paires de frames pré-générées (aucune capture écran)"""
+    def __init__(self, frames):
+        self.frames = frames
+        self.index = 0
+
+    def read(self):
+        frames = self.frames[self.index]
+        self.index = (self.index + 1) % len(self.frames)
+        return frames
+
+class ScreenGrabber:
+    """Faux écran : grab() retourne tour à tour des captures BGRA pré-rendues (comme XShmGrabber, sans allocation)"""
+    def __init__(self, screens):
+        self.screens = screens
+        self.index = 0
+
+    def grab(self, region):
+        screen = self.screens[self.index]
+        self.index = (self.index + 1) % len(self.screens)
+        return screen
+
+    def close(self):
+        pass
+
+class NullInput:
+    def mouseDown(self):
+        pass
+
+    def mouseUp(self):
+        pass
+
+    def click(self):
+        pass
+
+class AllocationProbe(FrameSource):
+    """
+    Source de la boucle réelle (capture_bars sur ScreenGrabber) qui mesure la
+    mémoire tracée (tracemalloc) entre deux read() : pic au-dessus du début du
+    tick et croissance nette, après `warmup` ticks
+    """
+    def __init__(self, bot, ticks, warmup):
+        self.bot = bot
+        self.ticks = ticks
+        self.warmup = warmup
+        self.count = 0
+        self.peaks = np.zeros(ticks, np.int64)
+        self.start_memory = None
+        self.tick_memory = None
+
+    def read(self):
+        current, peak = tracemalloc.get_traced_memory()
+        index = self.count - self.warmup
+        if index >= 0:
+            if self.start_memory is None:
+                self.start_memory = current
+            else:
+                self.peaks[index - 1] = peak - self.tick_memory
+            if index == self.ticks:
+                self.growth = current - self.start_memory
+                return None
+        self.count += 1
+        # Vidé comme le ferait le thread du GUI, avant la mesure du tick (copie des stats côté GUI)
+        self.bot.telemetry.drain()
+        tracemalloc.reset_peak()
+        self.tick_memory = tracemalloc.get_traced_memory()[0]
+        return self.bot.capture_bars()
+
+def check_allocations(ticks=20000, warmup=2000, seed=0, limit=2048, growth_limit=8192):
+    """
+    Allocation par tick de GPOFishingBot.run en régime permanent (mini-jeu,
+    cadence libre, boîte noire, trace et télémétrie GUI actives) : pic
+    tracemalloc par tick et croissance nette après warmup ticks
+
+    Réussi si aucun tick ne dépasse `limit` octets : il ne reste que les objets
+    Python éphémères (vues, scalaires : ~1 Ko, 1,2 Ko au pire), aucun buffer.
+    Tout tableau de 2 Ko ou plus alloué dans le tick (capture, frame
+    convertie, masque ou profil de la barre) fait dépasser la limite ; un
+    petit tableau de quelques centaines d'octets reste sous la marge. La
+    croissance nette doit rester sous `growth_limit` : les caches internes de
+    numpy (petits tableaux de dimensions) se remplissent sur les premiers
+    milliers de ticks puis plafonnent vers 4 Ko, une fuite par tick dépasse.
+    """
+    bot = GPOFishingBot()
+    bot.set_bar_position(100, 100)
+    region = bot.capture_region
+    screens = []
+    for gray_y, white_y, progress in make_trajectory(256, seed):
+        screen = np.zeros((region['height'], region['width'], 4), np.uint8)
+        screen[bot.blue_slice][..., :3] = make_blue_frame(gray_y, white_y)
+        screen[bot.green_slice][..., :3] = make_green_frame(progress)
+        screens.append(screen)
+    bot.sct = ScreenGrabber(screens)
+    bot.input = NullInput()
+    bot.start_delay = 0
+    bot.persist_stats = False
+    bot.tick_rates = {MINIGAME: None}
+    bot.cpu_budgets = {MINIGAME: None}
+    bot.long_minigame_s = float('inf')
+    probe = bot.frame_source = AllocationProbe(bot, ticks, warmup)
+
+    tracemalloc.start()
+    try:
+        bot.run()
+    finally:
+        tracemalloc.stop()
+    peaks = probe.peaks
+    return {
+        'ticks': ticks,
+        'peak_p50_bytes': int(np.percentile(peaks, 50)),
+        'peak_p99_bytes': int(np.percentile(peaks, 99)),
+        'peak_max_bytes': int(peaks.max()),
+        'ticks_over_limit': int(np.count_nonzero(peaks > limit)),
+        'growth_bytes': int(probe.growth),
+        'limit_bytes': limit,
+        'growth_limit_bytes': growth_limit,
+        'passed': bool(peaks.max() <= limit and probe.growth <= growth_limit),
+    }
+
+def measure(fn, args_list, iterations, warmup=50):
+    """Latence par appel (µs) : p50/p95/p99/mean/max + débit en appels/s"""
+    for i in range(warmup):
+        fn(*args_list[i % len(args_list)])
+    samples = np.empty(iterations, np.float64)
+    perf_counter_ns = time.perf_counter_ns
+    for i in range(iterations):
+        args = args_list[i % len(args_list)]
+        start = perf_counter_ns()
+        fn(*args)
+        samples[i] = perf_counter_ns() - start
+    samples /= 1000.0
+    return {
+        'p50_us': float(np.percentile(samples, 50)),
+        'p95_us': float(np.percentile(samples, 95)),
+        'p99_us': float(np.percentile(samples, 99)),
+        'mean_us': float(samples.mean()),
+        'max_us': float(samples.max()),
+        'throughput_per_s': float(1e6 / samples.mean()),
+        'iterations': iterations,
+    }
+
+def run_benchmarks(iterations, seed=0):
+    bot = GPOFishingBot()
+    scenarios = make_scenarios(64, seed)
+    blue_frames = [(make_blue_frame(g, w),) for g, w, _ in scenarios]
+    green_frames = [(make_green_frame(p),) for _, _, p in scenarios]
+    positions = [(g, w) for g, w, _ in scenarios]
+    trajectory = [(make_blue_frame(g, w),) for g, w, _ in make_trajectory(256, seed)]
+    tracked = measure(bot.detect_blue_tracked, trajectory, iterations)
+    tracked['fallback_rate'] = bot.track_fallbacks / bot.track_ticks
+
+    # Tick de mini-jeu tel que run() l'exécute (bot à part : suivi et EMA de remplissage propres)
+    tick_bot = GPOFishingBot()
+    source = SyntheticFrameSource([(blue[0], make_green_frame(p)) for blue, (_, _, p) in zip(trajectory, scenarios * 4)])
+
+    def full_tick():
+        blue_frame, green_frame = source.read()
+        if tick_bot.roi_tracking:
+            white_y, gray_y = tick_bot.detect_blue_tracked(blue_frame)
+        else:
+            white_y, gray_y = tick_bot.detect_blue_frame(blue_frame)
+        now = time.perf_counter()
+        tick_bot.update_green_progress(green_frame, now)
+        if tick_bot.controller == "predictive":
+            decision = tick_bot.predictive.update(gray_y, white_y, now, tick_bot.pipeline_latency + tick_bot.latency_extra)
+        else:
+            decision = tick_bot.should_click_v4(gray_y, white_y)
+        tick_bot.get_tracking_stats().add_error(gray_y - (white_y - tick_bot.target_offset))
+        return decision
+
+    return {
+        'find_white_marker_y': measure(bot.find_white_marker_y, blue_frames, iterations),
+        'find_gray_zone_y': measure(bot.find_gray_zone_y, blue_frames, iterations),
+        'detect_blue_frame': measure(bot.detect_blue_frame, blue_frames, iterations),
+        'detect_blue_tracked': tracked,
+        'get_green_bar_progress': measure(bot.get_green_bar_progress, green_frames, iterations),
+        'measure_green_fill': measure(bot.measure_green_fill, green_frames, iterations),
+        'should_click_v4': measure(bot.should_click_v4, positions, iterations),
+        'full_tick': measure(full_tick, [()], iterations),
+    }
+
+def compare(results, baseline, threshold):
+    """Liste des régressions : p50 ou p95 plus lent que baseline * threshold"""
+    regressions = []
+    for name, stats in results.items():
+        ref = baseline.get(name)
+        if not ref:
+            continue
+        for key in ('p50_us', 'p95_us'):
+            if stats[key] > ref[key] * threshold:
+                regressions.append(f"{name}.{key}: {stats[key]:.2f}us > {ref[key]:.2f}us x {threshold}")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark of the detection and control hot path")
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help="Save results as JSON")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--threshold', type=float, default=1.25, help="Max allowed slowdown ratio vs baseline")
+    parser.add_argument('--alloc', action='store_true', help="Check that the steady-state tick allocates nothing (tracemalloc)")
+    parser.add_argument('--alloc-limit', type=int, default=2048, help="Max bytes allocated in any steady-state tick")
+    parser.add_argument('--alloc-growth', type=int, default=8192, help="Max net memory growth over the measured ticks")
+    args = parser.parse_args()
+
+    if args.alloc:
+        result = check_allocations(limit=args.alloc_limit, growth_limit=args.alloc_growth, seed=args.seed)
+        print(f"\n🧮 Steady-state tick: peak p50 {result['peak_p50_bytes']} B | p99 {result['peak_p99_bytes']} B | "
+              f"max {result['peak_max_bytes']} B ({result['ticks_over_limit']} ticks over {args.alloc_limit} B) | "
+              f"growth {result['growth_bytes']} B over {result['ticks']} ticks")
+        if not result['passed']:
+            print(f"❌ Allocations over {args.alloc_limit} B in a tick or growth over {args.alloc_growth} B")
+            raise SystemExit(1)
+        print("✅ No per-tick buffer allocation after warm-up")
+        raise SystemExit(0)
+
+    results = run_benchmarks(args.iterations, args.seed)
+
+    print(f"\n{'Benchmark':<24} {'p50':>9} {'p95':>9} {'p99':>9} {'calls/s':>11}")
+    print("-" * 66)
+    for name, stats in results.items():
+        print(f"{name:<24} {stats['p50_us']:7.1f}us {stats['p95_us']:7.1f}us {stats['p99_us']:7.1f}us {stats['throughput_per_s']:11.0f}")
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'machine': platform.node(), 'python': platform.python_version(),
+                       'timestamp': time.time(), 'results': results}, f, indent=2)
+        print(f"\n💾 Results saved to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over x{args.threshold}:")
+            for line in regressions:
+                print(f"   {line}")
+            raise SystemExit(1)
+        print(f"\n✅ No regression over x{args.threshold} vs {args.baseline}")
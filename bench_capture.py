@@ -0,0 +1,69 @@
+import argparse
+import time
+import numpy as np
+from fishing_bot import GPOFishingBot
+from xshm_capture import open_capture
+
+ITERATIONS = 500
+
+def time_per_tick(capture, iterations=ITERATIONS):
+    """Mesure le coût moyen d'une capture (ms par tick)"""
+    # Chauffe : première allocation mss / OpenCV hors mesure
+    for _ in range(10):
+        capture()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        capture()
+    return (time.perf_counter() - start) / iterations * 1000
+
+def capture_split(bot):
+    return bot.capture_blue_bar(), bot.capture_green_bar()
+
+def raw_grab(bot):
+    return np.asarray(bot.sct.grab(bot.capture_region))
+
+if __name__ == "__main__":
+    # Sans écran de jeu : xvfb-run -a -s "-screen 0 1280x720x24" python bench_capture.py --position 100 100
+    parser = argparse.ArgumentParser(description="Capture benchmark: split vs union grab, mss vs XShm")
+    parser.add_argument('--position', type=int, nargs=2, metavar=('X', 'Y'), help="Blue bar position instead of calibration.json")
+    parser.add_argument('--iterations', type=int, default=ITERATIONS)
+    parser.add_argument('--backends', nargs='+', default=['mss', 'xshm'], choices=['mss', 'xshm'])
+    args = parser.parse_args()
+
+    print("\n" + "="*50)
+    print("CAPTURE BENCHMARK - SPLIT vs UNION GRAB")
+    print("="*50)
+
+    bot = GPOFishingBot()
+    if args.position:
+        bot.set_bar_position(*args.position)
+    elif not bot.load_calibration():
+        print("❌ Not calibrated! Run the bot calibration first (or pass --position X Y).")
+        raise SystemExit(1)
+
+    region = bot.capture_region
+    print(f"\nUnion region: {region['width']}x{region['height']} @ ({region['left']},{region['top']})")
+    print(f"Iterations: {args.iterations}")
+
+    results = {}
+    for backend in args.backends:
+        try:
+            bot.sct = open_capture(backend)
+        except Exception as e:
+            print(f"\n⚠️ {backend}: unavailable ({e})")
+            continue
+        split_ms = time_per_tick(lambda: capture_split(bot), args.iterations)
+        union_ms = time_per_tick(bot.capture_bars, args.iterations)
+        raw_ms = time_per_tick(lambda: raw_grab(bot), args.iterations)
+        results[backend] = union_ms
+        bot.sct.close()
+
+        print(f"\n[{backend}]")
+        print(f"Raw grab:         {raw_ms:6.3f} ms/tick")
+        print(f"Split (2 grabs):  {split_ms:6.3f} ms/tick -> max {1000 / split_ms:7.1f} FPS")
+        print(f"Union (1 grab):   {union_ms:6.3f} ms/tick -> max {1000 / union_ms:7.1f} FPS")
+        print(f"⚡ Gain: {split_ms - union_ms:+.3f} ms/tick ({1000 / union_ms - 1000 / split_ms:+.1f} FPS)")
+
+    if 'mss' in results and 'xshm' in results:
+        print(f"\n⚡ XShm vs mss (union): {results['mss'] - results['xshm']:+.3f} ms/tick "
+              f"(x{results['mss'] / results['xshm']:.2f})")
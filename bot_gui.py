@@ -0,0 +1,249 @@
+import tkinter as tk
+from tkinter import ttk
+import threading
+import keyboard
+from telemetry import TelemetryChannel
+
+class ManualCalibrationWindow:
+    def __init__(self, on_complete_callback, last_x=None, last_y=None):
+        self.on_complete = on_complete_callback
+        self.dragging = False
+        self.start_x = 0
+        self.start_y = 0
+        self.rect_x = last_x if last_x is not None else 100
+        self.rect_y = last_y if last_y is not None else 100
+        self.rect_width = 40
+        self.rect_height = 400
+        
+        self.root = tk.Tk()
+        self.root.title("Manual Calibration")
+        self.root.attributes('-fullscreen', True)
+        self.root.attributes('-alpha', 0.3)
+        self.root.attributes('-topmost', True)
+        self.root.configure(bg='black')
+        
+        self.canvas = tk.Canvas(self.root, bg='black', highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        
+        self.rect = self.canvas.create_rectangle(
+            self.rect_x, self.rect_y,
+            self.rect_x + self.rect_width, self.rect_y + self.rect_height,
+            outline='cyan', width=3, fill='blue', stipple='gray50'
+        )
+        
+        self.text = self.canvas.create_text(
+            self.rect_x + self.rect_width // 2, self.rect_y - 20,
+            text="Drag this box over the blue bar\nPress ENTER to confirm",
+            fill='white', font=('Arial', 12, 'bold')
+        )
+        
+        self.canvas.bind('<Button-1>', self.on_press)
+        self.canvas.bind('<B1-Motion>', self.on_drag)
+        self.canvas.bind('<ButtonRelease-1>', self.on_release)
+        self.root.bind('<Return>', self.on_confirm)
+        self.root.bind('<Escape>', self.on_cancel)
+        
+    def on_press(self, event):
+        x1, y1, x2, y2 = self.canvas.coords(self.rect)
+        if x1 <= event.x <= x2 and y1 <= event.y <= y2:
+            self.dragging = True
+            self.start_x = event.x - x1
+            self.start_y = event.y - y1
+    
+    def on_drag(self, event):
+        if self.dragging:
+            new_x = event.x - self.start_x
+            new_y = event.y - self.start_y
+            self.canvas.coords(self.rect, new_x, new_y, 
+                             new_x + self.rect_width, new_y + self.rect_height)
+            self.canvas.coords(self.text, new_x + self.rect_width // 2, new_y - 20)
+    
+    def on_release(self, event):
+        self.dragging = False
+    
+    def on_confirm(self, event=None):
+        x1, y1, x2, y2 = self.canvas.coords(self.rect)
+        self.root.destroy()
+        self.on_complete(int(x1), int(y1), int(x2 - x1), int(y2 - y1))
+    
+    def on_cancel(self, event=None):
+        self.root.destroy()
+        self.on_complete(None, None, None, None)
+    
+    def show(self):
+        self.root.mainloop()
+
+class BotGUI:
+    def __init__(self, bot):
+        self.bot = bot
+        self.running = False
+        self.bot_thread = None
+        self.run_id = 0  # Numéro du run lancé par le GUI (messages de fin d'un run précédent ignorés)
+        
+        self.root = tk.Tk()
+        self.root.title("GPO Fishing Bot V14")
+        self.root.geometry("320x440")
+        self.root.resizable(False, False)
+        self.root.attributes('-topmost', True)
+        
+        style = ttk.Style()
+        style.configure('Big.TButton', font=('Arial', 12, 'bold'))
+        
+        main_frame = ttk.Frame(self.root, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        title_label = ttk.Label(main_frame, text="GPO Auto Fishing Bot", font=('Arial', 16, 'bold'))
+        title_label.pack(pady=5)
+        
+        version_label = ttk.Label(main_frame, text="V14 - Optimized Control", font=('Arial', 9, 'italic'))
+        version_label.pack(pady=2)
+        
+        self.status_label = ttk.Label(main_frame, text="Status: Stopped", font=('Arial', 10))
+        self.status_label.pack(pady=5)
+        
+        self.fish_label = ttk.Label(main_frame, text="Fish Caught: 0", font=('Arial', 12, 'bold'), foreground='green')
+        self.fish_label.pack(pady=5)
+        
+        # Panneau de performance live (alimenté par bot.telemetry)
+        perf_frame = ttk.LabelFrame(main_frame, text="Live", padding="5")
+        perf_frame.pack(pady=5, fill=tk.X)
+        self.perf_labels = {}
+        for key in ('ticks', 'latency', 'control', 'rate'):
+            label = ttk.Label(perf_frame, text="--", font=('Consolas', 9))
+            label.pack(anchor=tk.W)
+            self.perf_labels[key] = label
+        
+        self.cal_button = ttk.Button(main_frame, text="CALIBRATION (F7)", style='Big.TButton', state='disabled')
+        self.cal_button.pack(pady=5, fill=tk.X)
+        
+        self.start_button = ttk.Button(main_frame, text="START (F6)", style='Big.TButton', state='disabled')
+        self.start_button.pack(pady=5, fill=tk.X)
+        
+        self.exit_button = ttk.Button(main_frame, text="EXIT (Q)", command=self.exit_app, style='Big.TButton')
+        self.exit_button.pack(pady=5, fill=tk.X)
+        
+        if self.bot.load_calibration():
+            self.status_label.config(text="Status: Calibrated")
+        
+        # Charger le compteur de poissons
+        self.bot.load_fish_count()
+        self.fish_label.config(text=f"Fish Caught: {self.bot.fish_count}")
+        
+        # Actions des hotkeys globales : le thread keyboard ne touche pas Tk, il passe par un canal
+        self.hotkey_events = TelemetryChannel()
+        self.poll_interval = 250  # ms : rafraîchissement du GUI, indépendant de la boucle de la bot
+        
+        self.root.bind('q', lambda e: self.exit_app())
+        self.root.bind('Q', lambda e: self.exit_app())
+        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
+        
+        try:
+            keyboard.add_hotkey('f6', lambda: self.hotkey_events.publish({'type': 'hotkey', 'action': 'start'}), suppress=False)
+            keyboard.add_hotkey('f7', lambda: self.hotkey_events.publish({'type': 'hotkey', 'action': 'calibrate'}), suppress=False)
+            keyboard.add_hotkey('f8', self.bot.dump_trace, suppress=False)
+            print("✅ Global hotkeys active: F6=Start/Stop, F7=Calibration, F8=Dump trace")
+            self.bot.stop_hint = "Press F6 to stop"
+        except:
+            print("⚠️ Global hotkeys unavailable")
+            self.bot.stop_hint = "Press Q (closes the bot) to stop"
+        
+        # Vide les canaux de télémétrie / hotkeys sur le thread Tk
+        self.poll_events()
+    
+    def calibrate(self):
+        print("\n▶️ Starting calibration...")
+        self.status_label.config(text="Status: Calibrating...")
+        
+        def do_calibration():
+            status = "Calibrated" if self.bot.manual_calibrate() else "Stopped"
+            self.bot.telemetry.publish({'type': 'status', 'status': status})
+        
+        threading.Thread(target=do_calibration, daemon=True).start()
+    
+    def poll_events(self):
+        """Applique les messages en attente (thread Tk uniquement) puis se replanifie"""
+        for event in self.hotkey_events.drain():
+            if event['action'] == 'start':
+                self.start_bot()
+            elif event['action'] == 'calibrate':
+                self.calibrate()
+        
+        stats = None
+        for message in self.bot.telemetry.drain():
+            if message.get('run', self.run_id) != self.run_id:
+                continue  # Fin d'un run précédent arrivée après un redémarrage rapide
+            if message['type'] == 'status':
+                self.status_label.config(text=f"Status: {message['status']}")
+            elif message['type'] == 'stopped':
+                self.running = False
+                self.start_button.config(text="START (F6)")
+                if self.status_label.cget("text") != "Status: Error":
+                    self.status_label.config(text="Status: Stopped")
+            elif message['type'] == 'stats':
+                stats = message  # Seul le plus récent est affiché
+        if stats is not None:
+            self.show_stats(stats)
+        
+        self.root.after(self.poll_interval, self.poll_events)
+    
+    def show_stats(self, stats):
+        self.fish_label.config(text=f"Fish Caught: {stats['fish_count']}")
+        stages = stats['stages_ms']
+        self.perf_labels['ticks'].config(text=f"{stats['state'] or '--':<9} {stats['tick_rate']:6.1f} ticks/s")
+        if stages:
+            self.perf_labels['latency'].config(
+                text=f"Tick {stages['tick']:5.2f}ms | grab {stages['grab']:4.2f} | detect {stages['blue_detect']:4.2f}")
+        else:
+            self.perf_labels['latency'].config(text="Tick --")
+        dist = f"{stats['distance']:+.0f}px" if stats['distance'] is not None else "--"
+        self.perf_labels['control'].config(text=f"Duty {stats['duty_cycle']:3d}% | Dist {dist:>6} | Green {stats['progress']:3.0f}%")
+        self.perf_labels['rate'].config(text=f"{stats['fish_per_hour']:5.1f} fish/h (session)")
+    
+    def start_bot(self):
+        if not self.bot.calibrated:
+            print("⚠️ Please calibrate first!")
+            return
+        
+        if self.running:
+            print("\n⏸️ Stopping bot...")
+            self.bot.running = False
+            self.running = False
+            self.status_label.config(text="Status: Stopped")
+            self.start_button.config(text="START (F6)")
+        else:
+            print("\n▶️ Starting bot...")
+            
+            self.running = True
+            self.bot.running = True
+            self.run_id += 1
+            self.status_label.config(text="Status: Fishing...")
+            self.start_button.config(text="STOP (F6)")
+            self.bot_thread = threading.Thread(target=self.run_bot_thread, args=(self.run_id,), daemon=True)
+            self.bot_thread.start()
+    
+    def run_bot_thread(self, run_id):
+        # Thread de la bot : aucun accès aux widgets, tout passe par bot.telemetry
+        try:
+            self.bot.run(debug=False)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            self.bot.telemetry.publish({'type': 'status', 'status': "Error", 'run': run_id})
+        finally:
+            self.bot.telemetry.publish({'type': 'stopped', 'run': run_id})
+    
+    def exit_app(self):
+        print("\n👋 Closing...")
+        self.bot.running = False
+        if self.bot.is_clicking and self.bot.input is not None:
+            self.bot.input.mouseUp()
+        try:
+            keyboard.remove_hotkey('f6')
+            keyboard.remove_hotkey('f7')
+            keyboard.remove_hotkey('f8')
+        except:
+            pass
+        self.root.quit()
+        self.root.destroy()
+    
+    def run(self):
+        self.root.mainloop()
@@ -0,0 +1,175 @@
+import threading
+import time
+
+class PyAutoGuiInput:
+    """
+    Envoie les clics au jeu via pyautogui
+
+    pause=False désactive la pause automatique de pyautogui après chaque appel
+    (indispensable pour un timing de clic précis)
+    position=(x, y) cible un client précis (le curseur y est déplacé à chaque
+    action) ; None = clic à la position actuelle du curseur
+    """
+    def __init__(self, pause=True, position=None):
+        import pyautogui
+        self.pyautogui = pyautogui
+        self.pause = pause
+        self.point = {} if position is None else {'x': position[0], 'y': position[1]}
+
+    def mouseDown(self):
+        self.pyautogui.mouseDown(**self.point, _pause=self.pause)
+
+    def mouseUp(self):
+        self.pyautogui.mouseUp(**self.point, _pause=self.pause)
+
+    def click(self):
+        self.pyautogui.click(**self.point, _pause=self.pause)
+
+class RecordingInput:
+    """
+    Stub d'entrée pour les runs headless : n'envoie rien, enregistre les actions
+
+    events: liste de (timestamp, action) avec action = "down", "up" ou "click"
+    """
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.events = []
+
+    def mouseDown(self):
+        self.events.append((self.clock(), "down"))
+
+    def mouseUp(self):
+        self.events.append((self.clock(), "up"))
+
+    def click(self):
+        self.events.append((self.clock(), "click"))
+
+class ArbitratedInput:
+    """
+    Entrée d'une instance dont la souris de l'OS est partagée (MouseArbiter)
+
+    mouseDown / mouseUp / click décrivent seulement l'état voulu (bouton
+    enfoncé, clic en attente) : jamais bloquant pour la boucle de la bot.
+    L'arbitre l'applique sur `target` (PyAutoGuiInput positionné sur la
+    fenêtre de l'instance) quand l'instance a la main.
+    """
+    def __init__(self, arbiter, target):
+        self.arbiter = arbiter
+        self.target = target
+        self.want_pressed = False
+        self.pending_clicks = 0
+        self.last_action = None
+        self.clicks_sent = 0
+        self.turns = 0
+
+    def mouseDown(self):
+        self.arbiter.update(self, pressed=True)
+
+    def mouseUp(self):
+        self.arbiter.update(self, pressed=False)
+
+    def click(self):
+        self.arbiter.update(self, click=True)
+
+class MouseArbiter:
+    """
+    Partage l'unique curseur / bouton de souris de l'OS entre plusieurs bots
+
+    Un seul thread touche la souris : il applique l'état voulu de l'instance
+    qui a la main. Elle la garde tant que son bouton est enfoncé ou qu'elle a
+    agi depuis moins de lease_s (les clics d'un mini-jeu se suivent de bien
+    moins), puis la main passe à tour de rôle à la suivante qui attend, ses
+    clics en attente ramenés à un seul (deux lancers de suite ramèneraient la
+    ligne). Une instance qui attend pendant le mini-jeu d'une autre ne clique
+    qu'à son tour : son lancer est retardé, ou sa touche ratée.
+    """
+    def __init__(self, lease_s=0.5):
+        self.lease_s = lease_s
+        self.inputs = []
+        self.owner = None
+        self.pressed = False  # État réel du bouton (côté OS)
+        self.condition = threading.Condition()
+        self.stopped = False
+        self.handoffs = 0
+        self.thread = None
+
+    def input(self, target):
+        """Nouvelle entrée arbitrée qui agit sur target quand elle a la main"""
+        arbitrated = ArbitratedInput(self, target)
+        self.inputs.append(arbitrated)
+        return arbitrated
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Arrête le thread ; le bouton est relâché s'il était enfoncé, les clics en attente ne sont pas envoyés"""
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    def update(self, source, pressed=None, click=False):
+        with self.condition:
+            if pressed is not None:
+                source.want_pressed = pressed
+            if click:
+                source.pending_clicks += 1
+            source.last_action = time.perf_counter()
+            self.condition.notify_all()
+
+    def _waiting(self, source):
+        return source.want_pressed or source.pending_clicks > 0
+
+    def _elect(self, now):
+        """Instance qui a la main : l'actuelle tant que son bail court, sinon la suivante qui attend ; (instance, échéance du bail)"""
+        owner = self.owner
+        if owner is not None:
+            expiry = owner.last_action + self.lease_s
+            if self.pressed or self._waiting(owner) or now < expiry:
+                return owner, expiry
+        start = self.inputs.index(owner) + 1 if owner is not None else 0
+        for k in range(len(self.inputs)):
+            candidate = self.inputs[(start + k) % len(self.inputs)]
+            if self._waiting(candidate):
+                if candidate is not owner:
+                    candidate.pending_clicks = min(candidate.pending_clicks, 1)
+                    candidate.turns += 1
+                    self.handoffs += 1
+                return candidate, None
+        return owner, None
+
+    def _loop(self):
+        while True:
+            with self.condition:
+                while not self.stopped:
+                    now = time.perf_counter()
+                    owner, expiry = self._elect(now)
+                    self.owner = owner
+                    if owner is not None and (owner.want_pressed != self.pressed or owner.pending_clicks):
+                        break
+                    # Rien à appliquer : attente d'une action, ou de la fin du bail si une autre instance attend
+                    others = any(self._waiting(i) for i in self.inputs if i is not owner)
+                    self.condition.wait(timeout=expiry - now if others and expiry is not None and now < expiry else None)
+                if self.stopped:
+                    break
+                press = owner.want_pressed
+                clicks, owner.pending_clicks = owner.pending_clicks, 0
+            # Hors du lock : les bots ne bloquent jamais sur un appel pyautogui
+            target = owner.target
+            if press != self.pressed:
+                if press:
+                    target.mouseDown()
+                else:
+                    target.mouseUp()
+                self.pressed = press
+            for _ in range(clicks):
+                target.click()
+                owner.clicks_sent += 1
+        if self.pressed:
+            self.owner.target.mouseUp()
+            self.pressed = False
@@ -0,0 +1,50 @@
+import sys
+import time
+import numpy as np
+from fishing_bot import GPOFishingBot
+
+def load_blue_frames(path):
+    """Charge les frames bleues d'un enregistrement (.npy ou .npz avec clé 'blue')"""
+    data = np.load(path, mmap_mode='r')
+    if path.endswith('.npz'):
+        data = data['blue'] if 'blue' in data.files else data[data.files[0]]
+    if data.ndim == 3:
+        data = data[np.newaxis]
+    return data
+
+def legacy_detect(bot, frame):
+    return bot.find_white_marker_y(frame), bot.find_gray_zone_y(frame)
+
+def time_detector(detect, frames):
+    start = time.perf_counter()
+    for frame in frames:
+        detect(frame)
+    return (time.perf_counter() - start) / len(frames) * 1000
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python check_detection.py <frames.npy|session.npz> [...]")
+        raise SystemExit(1)
+
+    bot = GPOFishingBot()
+    frames = [np.ascontiguousarray(f) for path in sys.argv[1:] for f in load_blue_frames(path)]
+    print(f"📂 {len(frames)} blue frames loaded")
+
+    mismatches = 0
+    for i, frame in enumerate(frames):
+        expected = legacy_detect(bot, frame)
+        fused = bot.detect_blue_frame(frame)
+        if expected != fused:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"❌ Frame {i}: legacy={expected} fused={fused}")
+
+    legacy_ms = time_detector(lambda f: legacy_detect(bot, f), frames)
+    fused_ms = time_detector(bot.detect_blue_frame, frames)
+
+    print(f"\nLegacy detection: {legacy_ms:7.4f} ms/frame")
+    print(f"Fused detection:  {fused_ms:7.4f} ms/frame  (x{legacy_ms / fused_ms:.1f})")
+    if mismatches:
+        print(f"\n❌ {mismatches}/{len(frames)} frames differ")
+        raise SystemExit(1)
+    print(f"\n✅ All {len(frames)} frames match")
@@ -1,11 +1,17 @@
 import cv2
 import numpy as np
-import mss
 import time
 
+# Bleu clair de la barre : HSV environ [100-120, 100-255, 150-255]
+LOWER_BLUE = np.array([90, 80, 120])
+UPPER_BLUE = np.array([130, 255, 255])
+
 class BarDetector:
-    def __init__(self):
-        self.sct = mss.mss()
+    def __init__(self, sct=None):
+        if sct is None:
+            import mss
+            sct = mss.mss()
+        self.sct = sct
         
     def capture_screen_without_window(self):
         """Capture l'écran en excluant une zone pour éviter l'effet miroir"""
@@ -21,11 +27,7 @@ class BarDetector:
         hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
         
         # Détecter le bleu clair de la barre (ajusté pour le bleu clair qu'on voit sur ton screen)
-        # Bleu clair : HSV environ [100-120, 100-255, 150-255]
-        lower_blue = np.array([90, 80, 120])
-        upper_blue = np.array([130, 255, 255])
-        
-        mask_blue = cv2.inRange(hsv, lower_blue, upper_blue)
+        mask_blue = cv2.inRange(hsv, LOWER_BLUE, UPPER_BLUE)
         
         # Nettoyer le masque avec morphologie
         kernel = np.ones((5, 5), np.uint8)
@@ -52,6 +54,43 @@ class BarDetector:
         
         return None
     
+    def find_blue_bar_fast(self, frame, scale=4):
+        """
+        Version rapide de find_blue_bar_region (coarse-to-fine)
+        
+        1. Recherche grossière sur l'image sous-échantillonnée (1/scale) : seuil HSV + composantes connexes
+        2. Affinage en pleine résolution uniquement autour des candidats
+        frame: image BGR ou BGRA (capture mss brute acceptée, sans conversion plein écran)
+        """
+        conversion = cv2.COLOR_BGRA2BGR if frame.shape[2] == 4 else None
+        # Sous-échantillonnage simple (1 pixel sur scale) : bien plus rapide qu'un resize filtré
+        small = cv2.cvtColor(frame[::scale, ::scale], conversion) if conversion is not None else np.ascontiguousarray(frame[::scale, ::scale])
+        mask = cv2.inRange(cv2.cvtColor(small, cv2.COLOR_BGR2HSV), LOWER_BLUE, UPPER_BLUE)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask)
+        
+        # Candidats verticaux (mêmes critères que la pleine résolution, à l'échelle), plus gros d'abord
+        candidates = []
+        for x, y, w, h, area in stats[1:]:
+            if h * scale > 150 and w * scale > 6 and h > w * 3:
+                candidates.append((area, x, y, w, h))
+        candidates.sort(reverse=True)
+        
+        margin = 2 * scale
+        for _, x, y, w, h in candidates:
+            left = max(0, x * scale - margin)
+            top = max(0, y * scale - margin)
+            right = min(frame.shape[1], (x + w) * scale + margin)
+            bottom = min(frame.shape[0], (y + h) * scale + margin)
+            roi = frame[top:bottom, left:right]
+            if conversion is not None:
+                roi = cv2.cvtColor(roi, conversion)
+            bar = self.find_blue_bar_region(np.ascontiguousarray(roi))
+            if bar:
+                bar['x'] = int(bar['x'] + left)
+                bar['y'] = int(bar['y'] + top)
+                return bar
+        return None
+    
     def find_green_bar_near_blue(self, frame, blue_bar):
         """
         Cherche la barre verte à droite de la barre bleue
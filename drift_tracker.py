@@ -0,0 +1,104 @@
+import threading
+import time
+import cv2
+import numpy as np
+from detect_bars import LOWER_BLUE, UPPER_BLUE
+from loop_pacer import MINIGAME
+
+WHITE_LOWER = np.array([240, 240, 240])
+WHITE_UPPER = np.array([255, 255, 255])
+KERNEL = np.ones((3, 3), np.uint8)
+
+class DriftTracker:
+    """
+    Suivi en arrière-plan de la position de la barre (fenêtre déplacée, UI décalée)
+
+    Toutes les `interval` secondes pendant le mini-jeu : grab de la zone bleue
+    + 2 * `margin` px de chaque côté, template matching du contour de la barre
+    (zone bleue + `margin` px) contre le contour de référence. Décalages
+    détectés jusqu'à ±margin px. Si la barre s'est décalée, le décalage est
+    transmis à la boucle du bot (GPOFishingBot.request_shift), qui recale la
+    calibration entre deux ticks ; la correction est loguée.
+    """
+    def __init__(self, bot, interval=5.0, margin=12, min_score=0.8, min_gain=0.05):
+        self.bot = bot
+        self.interval = interval
+        self.margin = margin
+        self.min_score = min_score
+        self.min_gain = min_gain
+        self.template = None
+        self.corrections = []  # (timestamp, dx, dy, score)
+        self.checks = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def _loop(self):
+        # Instance de capture propre au thread (handles liés au thread)
+        from xshm_capture import open_capture
+        with open_capture(self.bot.capture_backend) as sct:
+            while not self.stop_event.wait(self.interval):
+                pacer = self.bot.pacer
+                if pacer is None or pacer.state != MINIGAME:
+                    continue
+                try:
+                    self.check(sct)
+                except Exception as e:
+                    print(f"⚠️ Drift check failed: {e}")
+
+    def bar_silhouette(self, frame):
+        """
+        Masque de la barre entière : bleu + zone grise + marqueur blanc
+
+        La zone grise et le marqueur bougent pendant le mini-jeu mais restent
+        dans la barre : la silhouette ne dépend que de la position de la barre.
+        """
+        bgr = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+        silhouette = cv2.inRange(cv2.cvtColor(bgr, cv2.COLOR_BGR2HSV), LOWER_BLUE, UPPER_BLUE)
+        silhouette |= cv2.inRange(bgr, self.bot.gray_zone_lower, self.bot.gray_zone_upper)
+        silhouette |= cv2.inRange(bgr, WHITE_LOWER, WHITE_UPPER)
+        # Bouche les pixels de transition (anti-aliasing) entre la zone et le bleu
+        return cv2.morphologyEx(silhouette, cv2.MORPH_CLOSE, KERNEL)
+
+    def check(self, sct):
+        """Un contrôle de dérive ; retourne (dx, dy) transmis au bot ou None"""
+        if self.bot.pending_shifts:
+            return None  # Correction précédente pas encore appliquée
+        blue = self.bot.blue_bar
+        m = self.margin
+        region = {"top": blue['top'] - 2 * m, "left": blue['left'] - 2 * m,
+                  "width": blue['width'] + 4 * m, "height": blue['height'] + 4 * m}
+        silhouette = self.bar_silhouette(np.asarray(sct.grab(region)))
+        # Contour seul : un décalage de quelques px change peu une silhouette pleine de 40x400
+        outline = cv2.morphologyEx(silhouette, cv2.MORPH_GRADIENT, KERNEL)
+        self.checks += 1
+
+        if self.template is None:
+            # Référence prise quand la barre est bien visible à la position calibrée
+            inner = silhouette[2 * m:2 * m + blue['height'], 2 * m:2 * m + blue['width']]
+            if np.count_nonzero(inner) >= 0.3 * inner.size:
+                self.template = outline[m:m + blue['height'] + 2 * m, m:m + blue['width'] + 2 * m].copy()
+            return None
+
+        scores = cv2.matchTemplate(outline, self.template, cv2.TM_CCORR_NORMED)
+        _, best, _, (x, y) = cv2.minMaxLoc(scores)
+        centered = scores[m, m]
+        dx, dy = x - m, y - m
+        if (dx, dy) == (0, 0) or best < self.min_score or best - centered < self.min_gain:
+            return None
+
+        self.bot.request_shift(dx, dy)
+        self.corrections.append((time.time(), dx, dy, float(best)))
+        print(f"\n🧭 Drift corrected: dx={dx:+d}px dy={dy:+d}px (match {best:.2f}) -> "
+              f"X={blue['left'] + dx}, Y={blue['top'] + dy}")
+        return dx, dy
@@ -1,84 +1,22 @@
 import cv2
 import numpy as np
-import mss
-import pyautogui
 import time
-import tkinter as tk
-from tkinter import ttk
-import threading
-import keyboard
 import json
 import os
 import ctypes
-
-class ManualCalibrationWindow:
-    def __init__(self, on_complete_callback, last_x=None, last_y=None):
-        self.on_complete = on_complete_callback
-        self.dragging = False
-        self.start_x = 0
-        self.start_y = 0
-        self.rect_x = last_x if last_x is not None else 100
-        self.rect_y = last_y if last_y is not None else 100
-        self.rect_width = 40
-        self.rect_height = 400
-        
-        self.root = tk.Tk()
-        self.root.title("Manual Calibration")
-        self.root.attributes('-fullscreen', True)
-        self.root.attributes('-alpha', 0.3)
-        self.root.attributes('-topmost', True)
-        self.root.configure(bg='black')
-        
-        self.canvas = tk.Canvas(self.root, bg='black', highlightthickness=0)
-        self.canvas.pack(fill=tk.BOTH, expand=True)
-        
-        self.rect = self.canvas.create_rectangle(
-            self.rect_x, self.rect_y,
-            self.rect_x + self.rect_width, self.rect_y + self.rect_height,
-            outline='cyan', width=3, fill='blue', stipple='gray50'
-        )
-        
-        self.text = self.canvas.create_text(
-            self.rect_x + self.rect_width // 2, self.rect_y - 20,
-            text="Drag this box over the blue bar\nPress ENTER to confirm",
-            fill='white', font=('Arial', 12, 'bold')
-        )
-        
-        self.canvas.bind('<Button-1>', self.on_press)
-        self.canvas.bind('<B1-Motion>', self.on_drag)
-        self.canvas.bind('<ButtonRelease-1>', self.on_release)
-        self.root.bind('<Return>', self.on_confirm)
-        self.root.bind('<Escape>', self.on_cancel)
-        
-    def on_press(self, event):
-        x1, y1, x2, y2 = self.canvas.coords(self.rect)
-        if x1 <= event.x <= x2 and y1 <= event.y <= y2:
-            self.dragging = True
-            self.start_x = event.x - x1
-            self.start_y = event.y - y1
-    
-    def on_drag(self, event):
-        if self.dragging:
-            new_x = event.x - self.start_x
-            new_y = event.y - self.start_y
-            self.canvas.coords(self.rect, new_x, new_y, 
-                             new_x + self.rect_width, new_y + self.rect_height)
-            self.canvas.coords(self.text, new_x + self.rect_width // 2, new_y - 20)
-    
-    def on_release(self, event):
-        self.dragging = False
-    
-    def on_confirm(self, event=None):
-        x1, y1, x2, y2 = self.canvas.coords(self.rect)
-        self.root.destroy()
-        self.on_complete(int(x1), int(y1), int(x2 - x1), int(y2 - y1))
-    
-    def on_cancel(self, event=None):
-        self.root.destroy()
-        self.on_complete(None, None, None, None)
-    
-    def show(self):
-        self.root.mainloop()
+from collections import deque
+from detect_bars import BarDetector
+from drift_tracker import DriftTracker
+from session_store import SessionStore
+from flight_recorder import FlightRecorder
+from frame_source import MssFrameSource, ThreadedFrameSource
+from bot_input import PyAutoGuiInput
+from pwm_clicker import PWMClicker
+from tick_trace import TickTracer
+from self_tuner import OnlineTuner
+from predictive_control import PredictiveController, TrackingStats, V4_DUTY_TABLE
+from telemetry import TelemetryChannel
+from loop_pacer import LoopPacer, DEFAULT_TICK_RATES, IDLE, CASTING, WAITING, MINIGAME, COOLDOWN
 
 class GPOFishingBot:
     def __init__(self):
@@ -94,14 +32,136 @@ class GPOFishingBot:
         self.green_bar_width = 22
         self.green_bar_height = 319
         
+        # Seuils de détection
+        self.gray_zone_lower = np.array([15, 15, 15])
+        self.gray_zone_upper = np.array([35, 35, 35])
+        self.green_lower = np.array([25, 20, 20])
+        self.green_upper = np.array([95, 255, 255])
+        
+        # Progression verte par colonnes échantillonnées
+        self.green_sample_count = 3
+        self.green_columns = None
+        self.green_rate_smoothing = 0.5  # Constante de temps du lissage de la vitesse (s)
+        self.reset_green_progress()
+        
+        # Suivi incrémental (bande autour des dernières positions)
+        self.roi_tracking = True
+        self.track_margin = 24          # Marge en pixels autour des dernières positions
+        self.track_full_scan_every = 60  # Scan complet de contrôle périodique
+        self.track_gray_extent = 0
+        self.last_white_y = None
+        self.last_gray_y = None
+        self.track_ticks = 0
+        self.track_full_scans = 0
+        self.track_fallbacks = 0
+        
         self.blue_bar = None
         self.green_bar = None
         self.calibrated = False
+        self.auto_calibrate_on_start = False  # True = recherche plein écran au lancement (écrase calibration.json)
+        self.drift_tracking = True  # Recalage en arrière-plan si la barre se décale
+        self.drift_interval = 5.0
+        self.drift_tracker = None
+        self.pending_shifts = deque()  # (dx, dy) demandés par le thread de dérive, appliqués entre deux ticks
+        self.calibration_dirty = False  # Recalage non sauvegardé : écrit une seule fois à l'arrêt
+        
+        # Capture unique : un seul grab couvrant bleue + verte
+        self.union_capture = True
+        self.capture_backend = "auto"  # "auto" (XShm zéro-copie sous Linux/X11, sinon mss), "xshm" ou "mss"
+        self.capture_region = None
+        self.blue_slice = None
+        self.green_slice = None
+        self.probe_region = None
+        
+        # Buffers du tick alloués une fois (calibration) et réutilisés via dst= / out= : aucune allocation par tick
+        self.buffers = {}
+        self.frame_buffer_count = 3  # Frames de capture tournantes : écriture, slot du pipeline, traitement
+        
+        # Source de frames / sortie souris (None = live mss / pyautogui)
+        self.frame_source = None
+        self.input = None
+        self.start_delay = 3
+        self.stop_hint = None  # Comment arrêter la bot, affiché au lancement (défini par le GUI / headless_bot)
+        self.pipelined = False  # True = thread de capture séparé (slot dernière frame)
+        self.pwm_clicking = False  # True = fronts de clic générés par PWMClicker (timer dédié)
+        self.clicker = None
+        self.tracing = True  # Timestamps par étape de chaque tick (TickTracer)
+        self.tracer = None
+        self.trace_path = None  # Export automatique de la trace à l'arrêt (.csv / .json)
+        
+        # Cadence par état (voir loop_pacer.DEFAULT_TICK_RATES / DEFAULT_CPU_BUDGETS)
+        self.tick_rates = {}
+        self.cpu_budgets = {}
+        self.pacer = None
+        self.cast_time = None
+        
+        # Sonde d'apparition de la barre pendant l'attente de la touche
+        self.appearance_probe = True
+        self.probe_min_fraction = 0.3  # Part minimale de pixels bleus dans la colonne
+        self.bar_seen_time = None
+        self.reaction_times = []
+        self.persist_stats = True  # False = ne pas écrire fish_count.json / sessions.jsonl (replay)
+        self.stats_path = 'sessions.jsonl'
+        self.count_path = 'fish_count.json'
+        self.calibration_path = 'calibration.json'
+        self.session_store = None
+        self.cycle = {}  # Horodatages du cycle en cours : start, cast, bite, end
+        
+        # Boîte noire : derniers ticks (frames + décisions) écrits sur anomalie
+        self.flight_recording = True
+        self.flight_seconds = 4.0
+        self.flight_dir = 'flight_dumps'
+        self.flight_recorder = None
+        # États enregistrés : pas COOLDOWN / IDLE (frames sans barre qui repousseraient le contexte utile hors de l'anneau)
+        self.flight_states = (CASTING, WAITING, MINIGAME)
+        self.long_minigame_s = 30.0     # Mini-jeu anormalement long
+        self.minigame_progress = 0.0
+        
+        # Fin de capture détectée : relance dès que la canne est prête au lieu d'un délai fixe
+        self.catch_progress = 90.0      # Barre disparue avec au moins ce % de vert = relance anticipée autorisée (n'affecte pas le comptage)
+        self.catch_complete = False
+        self.fast_recast = True
+        self.recast_delay = 1.0         # Délai fixe historique, gardé comme borne max
+        self.ready_settle_s = 0.15      # Zone de la barre immobile depuis ce temps = animation finie, canne prête
+        self.settle_threshold = 6.0     # Écart moyen (niveaux) entre deux ticks en dessous duquel la zone est immobile
+        self.settle_signature = None
+        self.settle_since = None
+        self.settle_index = 0
+        self.recast_times = []          # Barre disparue -> clic de relance (s), poissons attrapés
+        # Second clic si la zone de la barre reste immobile après une relance anticipée (heuristique non validée :
+        # un second clic peut ramener un lancer réussi, désactivé par défaut)
+        self.confirm_early_cast = False
+        self.cast_confirm_s = 0.5       # Relance anticipée sans mouvement du lancer pendant ce temps = clic ignoré, second clic
+        self.cast_unconfirmed = False
+        self.recast_retries = 0
+        self.long_minigame_dumped = False
+        
+        # Télémétrie vers le GUI (canal borné, vidé par le thread Tk)
+        self.telemetry = TelemetryChannel()
+        self.telemetry_interval = 0.25  # Publication au plus 4 fois par seconde
+        self.last_duty_cycle = 0
+        self.last_distance = None
+        self.session_fish = 0
         
         # === PARAMÈTRES V4 - CONTRÔLE PROPORTIONNEL ===
         self.target_offset = 40  # Zone grise doit être 40px AU-DESSUS du marqueur blanc
         self.tolerance = 5       # Tolérance en pixels
         self.click_interval = 0.1  # Intervalle entre micro-clics (10 CPS max)
+        self.duty_table = list(V4_DUTY_TABLE)  # (distance min, type de clic, duty cycle)
+        
+        # Contrôleur : "v4" (table de duty cycle) ou "predictive" (alpha-beta + projection de latence)
+        self.controller = "v4"
+        self.predictive = PredictiveController(self.target_offset)
+        self.latency_extra = 0.0     # Latence jeu/affichage ajoutée à la latence mesurée (s)
+        self.pipeline_latency = 0.0  # Moyenne glissante capture -> clic (s)
+        self.tracking_stats = {}
+        
+        # Réglage en ligne de target_offset / table de duty (optionnel, persisté par profil de calibration)
+        self.self_tuning = False
+        self.tuning_path = 'tuning.json'
+        self.tuner = None
+        self.minigame_error_sum = 0.0
+        self.minigame_ticks = 0
         
         # Timers
         self.last_action_time = 0
@@ -110,30 +170,110 @@ class GPOFishingBot:
         # Gestion des états
         self.bar_lost_time = None
         self.click_sent_for_restart = False
-        self.just_caught_fish = False
-        self.fish_caught_time = None
         self.fish_count = 0
         self.first_cast = True  # Pour ne pas compter le premier lancer
     
+    def set_bar_position(self, x, y):
+        """Positionne les zones bleue/verte à partir du coin haut-gauche de la barre bleue"""
+        self.blue_bar = {"top": y, "left": x, "width": self.blue_bar_width, "height": self.blue_bar_height}
+        self.green_bar = {"top": y + self.green_offset_y, "left": x + self.green_offset_x, "width": self.green_bar_width, "height": self.green_bar_height}
+        self.update_capture_region()
+    
+    def update_capture_region(self):
+        """Calcule la boîte englobante bleue + verte et les slices de chaque barre dedans"""
+        blue, green = self.blue_bar, self.green_bar
+        left = min(blue['left'], green['left'])
+        top = min(blue['top'], green['top'])
+        right = max(blue['left'] + blue['width'], green['left'] + green['width'])
+        bottom = max(blue['top'] + blue['height'], green['top'] + green['height'])
+        self.capture_region = {"top": top, "left": left, "width": right - left, "height": bottom - top}
+        self.blue_slice = (slice(blue['top'] - top, blue['top'] - top + blue['height']),
+                           slice(blue['left'] - left, blue['left'] - left + blue['width']))
+        self.green_slice = (slice(green['top'] - top, green['top'] - top + green['height']),
+                            slice(green['left'] - left, green['left'] - left + green['width']))
+        self.probe_region = {"top": blue['top'], "left": blue['left'] + blue['width'] // 2, "width": 1, "height": blue['height']}
+        self.allocate_buffers()
+    
+    def scratch(self, name, shape, dtype=np.uint8):
+        """
+        Buffer de travail réutilisé d'un tick à l'autre : vue [:shape[0]] d'un
+        buffer alloué une fois, réalloué seulement s'il est trop petit ou d'un autre format
+        """
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape[0] < shape[0] or buffer.shape[1:] != shape[1:] or buffer.dtype != dtype:
+            buffer = self.buffers[name] = np.empty(shape, dtype)
+        return buffer[:shape[0]]
+    
+    def frame_buffer(self, index=0):
+        """Buffer BGR n° index de la région de capture (cible de capture_bars)"""
+        region = self.capture_region
+        return self.scratch(('frame', index), (region['height'], region['width'], 3))
+    
+    def allocate_buffers(self):
+        """
+        Préalloue tous les buffers du tick pour la calibration courante : frames de
+        capture, profils de la barre bleue, colonnes vertes et signature de relance
+        
+        Sans effet sur les buffers déjà à la bonne taille (recalage de dérive
+        pendant un run) ; un buffer oublié ici est alloué au premier tick.
+        """
+        for index in range(self.frame_buffer_count):
+            self.frame_buffer(index)
+        rows, width = self.blue_bar_height, self.blue_bar_width
+        self.scratch('blue_mask', (rows, width))
+        self.scratch('white_rows', (rows, 1), np.int32)
+        self.scratch('gray_rows', (rows, 1), np.int32)
+        self.scratch('gray_extent', (rows,), np.bool_)
+        self.row_indices(rows)
+        height, count = self.green_bar_height, self.green_sample_count
+        self.scratch('green_columns', (height, count, 3))
+        self.scratch('green_hsv', (height, count, 3))
+        self.scratch('green_mask', (height, count))
+        self.scratch('green_rows', (height, 1), np.int32)
+        self.scratch('green_filled', (height, 1), np.bool_)
+        signature = (-(-rows // 8), -(-width // 8), 3)
+        for name in (('settle', 0), ('settle', 1), 'settle_diff'):
+            self.scratch(name, signature, np.int16)
+    
+    def request_shift(self, dx, dy):
+        """Demande un recalage depuis un autre thread (appliqué par run() avant le tick suivant)"""
+        self.pending_shifts.append((dx, dy))
+    
+    def apply_pending_shifts(self):
+        # Retiré de la file seulement une fois appliqué : DriftTracker ne recontrôle pas entre-temps
+        while self.pending_shifts:
+            self.shift_calibration(*self.pending_shifts[0])
+            self.pending_shifts.popleft()
+    
+    def shift_calibration(self, dx, dy):
+        """Décale la calibration (bleue + verte) sans arrêter le bot (thread de la boucle seulement)"""
+        self.set_bar_position(self.blue_bar['left'] + dx, self.blue_bar['top'] + dy)
+        # Les positions suivies sont relatives à l'ancienne zone : scan complet au prochain tick
+        self.last_white_y = None
+        self.last_gray_y = None
+        # Pas d'I/O dans la boucle : sauvegarde à l'arrêt de run()
+        self.calibration_dirty = True
+    
     def get_sct(self):
         if self.sct is None:
-            self.sct = mss.mss()
+            # Import différé : inutile en replay / benchmark
+            from xshm_capture import open_capture
+            self.sct = open_capture(self.capture_backend)
         return self.sct
     
     def save_calibration(self):
         if self.blue_bar:
             data = {'x': self.blue_bar['left'], 'y': self.blue_bar['top']}
-            with open('calibration.json', 'w') as f:
+            with open(self.calibration_path, 'w') as f:
                 json.dump(data, f)
             print("💾 Calibration saved")
     
     def load_calibration(self):
-        if os.path.exists('calibration.json'):
+        if os.path.exists(self.calibration_path):
             try:
-                with open('calibration.json', 'r') as f:
+                with open(self.calibration_path, 'r') as f:
                     data = json.load(f)
-                self.blue_bar = {"top": data['y'], "left": data['x'], "width": self.blue_bar_width, "height": self.blue_bar_height}
-                self.green_bar = {"top": data['y'] + self.green_offset_y, "left": data['x'] + self.green_offset_x, "width": self.green_bar_width, "height": self.green_bar_height}
+                self.set_bar_position(data['x'], data['y'])
                 self.calibrated = True
                 print(f"✅ Calibration loaded: X={data['x']}, Y={data['y']}")
                 return True
@@ -143,17 +283,23 @@ class GPOFishingBot:
     
     def save_fish_count(self):
         """Sauvegarde le nombre de poissons capturés"""
+        if not self.persist_stats:
+            return
+        if self.session_store is not None:
+            # Écriture par le thread du SessionStore : pas d'I/O dans la boucle
+            self.session_store.save_count(self.fish_count)
+            return
         try:
-            with open('fish_count.json', 'w') as f:
+            with open(self.count_path, 'w') as f:
                 json.dump({'count': self.fish_count}, f)
         except Exception as e:
             print(f"⚠️ Failed to save fish count: {e}")
     
     def load_fish_count(self):
         """Charge le nombre de poissons capturés depuis la dernière session"""
-        if os.path.exists('fish_count.json'):
+        if os.path.exists(self.count_path):
             try:
-                with open('fish_count.json', 'r') as f:
+                with open(self.count_path, 'r') as f:
                     data = json.load(f)
                     self.fish_count = data.get('count', 0)
                     print(f"✅ Fish count loaded: {self.fish_count}")
@@ -163,7 +309,7 @@ class GPOFishingBot:
         return False
     
     def manual_calibrate(self):
-        self.sct = mss.mss()
+        self.sct = None  # Nouvelle instance mss, créée par le thread qui fera le prochain grab
         
         print("\n🎯 Manual Calibration Mode")
         print("🔍 Applying zoom preset...")
@@ -200,23 +346,12 @@ class GPOFishingBot:
         
         last_x = self.blue_bar['left'] if self.blue_bar else None
         last_y = self.blue_bar['top'] if self.blue_bar else None
+        from bot_gui import ManualCalibrationWindow
         cal_window = ManualCalibrationWindow(on_calibration_complete, last_x, last_y)
         cal_window.show()
         
         if result['x'] is not None:
-            self.blue_bar = {
-                "top": result['y'],
-                "left": result['x'],
-                "width": self.blue_bar_width,
-                "height": self.blue_bar_height
-            }
-            
-            self.green_bar = {
-                "top": result['y'] + self.green_offset_y,
-                "left": result['x'] + self.green_offset_x,
-                "width": self.green_bar_width,
-                "height": self.green_bar_height
-            }
+            self.set_bar_position(result['x'], result['y'])
             
             self.calibrated = True
             print(f"✅ Calibration complete: X={result['x']}, Y={result['y']}")
@@ -226,20 +361,79 @@ class GPOFishingBot:
             print("❌ Calibration cancelled")
             return False
     
+    def auto_calibrate(self, frame=None, save=True):
+        """
+        Calibration automatique en un appel (recherche coarse-to-fine de la barre bleue)
+        
+        frame: capture plein écran BGR/BGRA (sinon capture du moniteur principal)
+        La boîte 40x400 est centrée sur la barre détectée, la verte en est déduite.
+        """
+        start = time.perf_counter()
+        sct = self.get_sct()
+        left, top = 0, 0
+        if frame is None:
+            monitor = sct.monitors[1]
+            left, top = monitor['left'], monitor['top']
+            frame = np.asarray(sct.grab(monitor))
+        
+        bar = BarDetector(sct).find_blue_bar_fast(frame)
+        elapsed = (time.perf_counter() - start) * 1000
+        if bar is None:
+            print(f"❌ Auto calibration: blue bar not found ({elapsed:.0f}ms)")
+            return False
+        
+        x = left + bar['x'] + bar['width'] // 2 - self.blue_bar_width // 2
+        y = top + bar['y'] + bar['height'] // 2 - self.blue_bar_height // 2
+        self.set_bar_position(x, y)
+        self.calibrated = True
+        print(f"✅ Auto calibration: X={x}, Y={y} ({elapsed:.0f}ms)")
+        if save:
+            self.save_calibration()
+        return True
+    
     def capture_blue_bar(self):
-        if self.sct is None:
-            self.sct = mss.mss()
-        screenshot = self.sct.grab(self.blue_bar)
+        screenshot = self.get_sct().grab(self.blue_bar)
         frame = np.array(screenshot)
         return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
     
     def capture_green_bar(self):
-        if self.sct is None:
-            self.sct = mss.mss()
-        screenshot = self.sct.grab(self.green_bar)
+        screenshot = self.get_sct().grab(self.green_bar)
         frame = np.array(screenshot)
         return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
     
+    def capture_bars(self, buffer=0):
+        """
+        Capture bleue + verte en UN SEUL grab (même instant pour les deux barres)
+        
+        Retourne: (blue_frame, green_frame) - deux vues NumPy sans copie
+        dans le buffer BGR préalloué n° buffer (réécrit à la capture suivante
+        dans ce buffer)
+        """
+        # Pas de marques depuis le thread de capture en mode pipeline
+        tracer = self.tracer if not self.pipelined else None
+        screenshot = self.get_sct().grab(self.capture_region)
+        if tracer is not None:
+            tracer.mark('grab')
+        frame = cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_BGRA2BGR, dst=self.frame_buffer(buffer))
+        if tracer is not None:
+            tracer.mark('convert')
+        return frame[self.blue_slice], frame[self.green_slice]
+    
+    def capture_probe_column(self):
+        """Grab d'une colonne de 1px au centre de la barre bleue (BGRA, sans conversion)"""
+        return np.asarray(self.get_sct().grab(self.probe_region))
+    
+    def probe_bar_visible(self, column):
+        """
+        Sonde ultra légère : la barre bleue est-elle à l'écran ?
+        
+        column: colonne de pixels BGR ou BGRA de la barre bleue
+        """
+        pixels = column.reshape(-1, column.shape[-1]).astype(np.int16)
+        b, g, r = pixels[:, 0], pixels[:, 1], pixels[:, 2]
+        blue = (b > 120) & (b > g) & (b > r + 40)
+        return np.count_nonzero(blue) >= self.probe_min_fraction * len(pixels)
+    
     def find_white_marker_y(self, blue_frame):
         gray = cv2.cvtColor(blue_frame, cv2.COLOR_BGR2GRAY)
         _, thresh = cv2.threshold(gray, 240, 255, cv2.THRESH_BINARY)
@@ -264,6 +458,89 @@ class GPOFishingBot:
             return best_y
         return None
     
+    def blue_row_profiles(self, blue_frame):
+        """
+        Nombre de pixels blancs (marqueur) et gris (zone) par ligne de la frame bleue
+        
+        Écrit dans les buffers de travail (réécrits à l'appel suivant).
+        """
+        rows, width = blue_frame.shape[:2]
+        mask = self.scratch('blue_mask', (rows, width))
+        cv2.cvtColor(blue_frame, cv2.COLOR_BGR2GRAY, dst=mask)
+        cv2.threshold(mask, 240, 1, cv2.THRESH_BINARY, dst=mask)
+        white_rows = cv2.reduce(mask, 1, cv2.REDUCE_SUM, dst=self.scratch('white_rows', (rows, 1), np.int32), dtype=cv2.CV_32S)
+        cv2.inRange(blue_frame, self.gray_zone_lower, self.gray_zone_upper, dst=mask)
+        gray_rows = cv2.reduce(mask, 1, cv2.REDUCE_SUM, dst=self.scratch('gray_rows', (rows, 1), np.int32), dtype=cv2.CV_32S)
+        np.floor_divide(gray_rows, 255, out=gray_rows)
+        return white_rows.ravel(), gray_rows.ravel()
+    
+    def positions_from_profiles(self, white_rows, gray_rows):
+        """(white_y, gray_y) à partir des profils par ligne"""
+        # Marqueur blanc : centroïde vertical (équivalent m01/m00 de cv2.moments)
+        white_y = None
+        # Réductions en int32 (sans conversion, donc sans buffer temporaire)
+        white_count = int(white_rows.sum(dtype=np.int32))
+        if white_count * 255 > 50:
+            white_y = int(int(np.vdot(self.row_indices(white_rows.shape[0]), white_rows)) / white_count)
+        
+        # Zone grise : première ligne avec le plus de pixels gris
+        gray_y = int(np.argmax(gray_rows))
+        if gray_rows[gray_y] < 15:
+            gray_y = None
+        return white_y, gray_y
+    
+    def row_indices(self, rows):
+        """0..rows-1 (int32) pour le centroïde, calculé une fois"""
+        indices = self.buffers.get('row_indices')
+        if indices is None or len(indices) < rows:
+            indices = self.buffers['row_indices'] = np.arange(max(rows, self.blue_bar_height), dtype=np.int32)
+        return indices[:rows]
+    
+    def gray_extent(self, gray_rows):
+        """Hauteur de la zone grise : nombre de lignes avec au moins 15 pixels gris"""
+        rows = self.scratch('gray_extent', gray_rows.shape, np.bool_)
+        return int(np.count_nonzero(np.greater_equal(gray_rows, 15, out=rows)))
+    
+    def detect_blue_frame(self, blue_frame):
+        """
+        Détection fusionnée : zone grise + marqueur blanc en une seule passe
+        
+        Même résultat que find_gray_zone_y / find_white_marker_y, mais sans
+        boucle Python : réductions par ligne sur toute la frame.
+        Retourne: (white_y, gray_y)
+        """
+        return self.positions_from_profiles(*self.blue_row_profiles(blue_frame))
+    
+    def detect_blue_tracked(self, blue_frame):
+        """
+        Détection incrémentale : ne scanne qu'une bande autour des dernières positions
+        
+        Retour au scan complet si une cible est perdue, si elle touche le bord
+        de la bande (résultat pas fiable) ou tous les track_full_scan_every ticks.
+        Retourne: (white_y, gray_y)
+        """
+        self.track_ticks += 1
+        if (self.last_white_y is not None and self.last_gray_y is not None
+                and self.track_ticks % self.track_full_scan_every):
+            height = blue_frame.shape[0]
+            top = max(0, min(self.last_white_y, self.last_gray_y) - self.track_margin)
+            bottom = min(height, max(self.last_white_y, self.last_gray_y + self.track_gray_extent) + self.track_margin)
+            white_rows, gray_rows = self.blue_row_profiles(blue_frame[top:bottom])
+            white_y, gray_y = self.positions_from_profiles(white_rows, gray_rows)
+            top_clear = top == 0 or (white_rows[0] == 0 and gray_rows[0] < 15)
+            bottom_clear = bottom == height or (white_rows[-1] == 0 and gray_rows[-1] < 15)
+            if white_y is not None and gray_y is not None and top_clear and bottom_clear:
+                self.last_white_y, self.last_gray_y = white_y + top, gray_y + top
+                return self.last_white_y, self.last_gray_y
+            self.track_fallbacks += 1
+        
+        self.track_full_scans += 1
+        white_rows, gray_rows = self.blue_row_profiles(blue_frame)
+        self.last_white_y, self.last_gray_y = self.positions_from_profiles(white_rows, gray_rows)
+        if self.last_gray_y is not None:
+            self.track_gray_extent = self.gray_extent(gray_rows)
+        return self.last_white_y, self.last_gray_y
+    
     def get_green_bar_progress(self, green_frame):
         hsv = cv2.cvtColor(green_frame, cv2.COLOR_BGR2HSV)
         lower_green = np.array([25, 20, 20])
@@ -275,6 +552,156 @@ class GPOFishingBot:
             return (green_pixels / total_pixels) * 100
         return 0.0
     
+    def measure_green_fill(self, green_frame):
+        """
+        Hauteur de remplissage de la barre verte (px) sur quelques colonnes échantillonnées
+        
+        Une ligne compte comme remplie si la majorité des colonnes échantillonnées est verte.
+        """
+        height, width = green_frame.shape[:2]
+        sample_columns = self.green_sample_columns(width)
+        count = len(sample_columns)
+        # Copie colonne par colonne (l'indexation avancée / np.take copient toute la frame verte)
+        columns = self.scratch('green_columns', (height, count, 3))
+        for index, column in enumerate(sample_columns):
+            columns[:, index] = green_frame[:, column]
+        hsv = cv2.cvtColor(columns, cv2.COLOR_BGR2HSV, dst=self.scratch('green_hsv', (height, count, 3)))
+        mask = cv2.inRange(hsv, self.green_lower, self.green_upper, dst=self.scratch('green_mask', (height, count)))
+        green_rows = cv2.reduce(mask, 1, cv2.REDUCE_SUM, dst=self.scratch('green_rows', (height, 1), np.int32), dtype=cv2.CV_32S)
+        # Majorité verte : count * 2 > colonnes, soit somme (255 par pixel vert) > 255 * (colonnes // 2)
+        filled = np.greater(green_rows, 255 * (count // 2), out=self.scratch('green_filled', (height, 1), np.bool_))
+        return int(np.count_nonzero(filled))
+    
+    def green_sample_columns(self, width):
+        if self.green_columns is None or self.green_columns[-1] >= width:
+            self.green_columns = np.linspace(2, width - 3, self.green_sample_count).astype(np.intp)
+        return self.green_columns
+    
+    def update_green_progress(self, green_frame, t):
+        """
+        Progression (%) + vitesse de remplissage lissée et temps estimé avant capture
+        
+        Met à jour green_fill (px), green_fill_rate (px/s) et catch_eta (s, None si
+        la barre ne se remplit pas), exposés au contrôleur et à la télémétrie.
+        """
+        height = green_frame.shape[0]
+        fill = self.measure_green_fill(green_frame)
+        if self.green_fill_time is not None and t > self.green_fill_time:
+            dt = t - self.green_fill_time
+            rate = (fill - self.green_fill) / dt
+            self.green_fill_rate += (1.0 - np.exp(-dt / self.green_rate_smoothing)) * (rate - self.green_fill_rate)
+        self.green_fill = fill
+        self.green_fill_time = t
+        self.catch_eta = (height - fill) / self.green_fill_rate if self.green_fill_rate > 0.5 else None
+        return fill / height * 100 if height else 0.0
+    
+    def reset_green_progress(self):
+        self.green_fill = 0
+        self.green_fill_rate = 0.0
+        self.green_fill_time = None
+        self.catch_eta = None
+    
+    def get_tracking_stats(self):
+        """Statistiques d'erreur de suivi du contrôleur sélectionné"""
+        if self.controller not in self.tracking_stats:
+            self.tracking_stats[self.controller] = TrackingStats(self.tolerance)
+        return self.tracking_stats[self.controller]
+    
+    def record_cycle(self, outcome):
+        """Envoie le cycle en cours au SessionStore (non bloquant)"""
+        cycle = self.cycle
+        if self.session_store is None or 'cast' not in cycle or 'end' not in cycle:
+            return
+        cast_s = cycle['cast'] - cycle['start'] if cycle.get('start') is not None else None
+        if 'bite' in cycle:
+            bite_s = cycle['bite'] - cycle['cast']
+            minigame_s = cycle['end'] - cycle['bite']
+        else:
+            bite_s = cycle['end'] - cycle['cast']
+            minigame_s = None
+        self.session_store.record_catch(cast_s, bite_s, minigame_s, outcome)
+    
+    def rod_ready(self, blue_frame, t):
+        """
+        Canne prête à relancer après une capture : la zone de la barre ne bouge
+        plus depuis ready_settle_s (animation de prise terminée)
+        
+        Signature sous-échantillonnée (1 pixel sur 8) comparée au tick précédent.
+        Toujours False sans capture confirmée : la relance retombe sur recast_delay.
+        """
+        if not (self.fast_recast and self.catch_complete):
+            return False
+        sampled = blue_frame[::8, ::8]
+        # Deux buffers en alternance : signature courante / précédente
+        previous = self.settle_signature
+        self.settle_index ^= 1
+        signature = self.scratch(('settle', self.settle_index), sampled.shape, np.int16)
+        np.copyto(signature, sampled)
+        self.settle_signature = signature
+        if previous is None or previous.shape != signature.shape:
+            self.settle_since = t
+            return False
+        diff = np.subtract(signature, previous, out=self.scratch('settle_diff', signature.shape, np.int16))
+        if np.abs(diff, out=diff).mean() > self.settle_threshold:
+            self.settle_since = t
+            return False
+        return t - self.settle_since >= self.ready_settle_s
+    
+    def cast_seen(self, blue_frame):
+        """
+        Lancer visible après une relance anticipée : la zone de la barre bouge à
+        nouveau par rapport à la signature immobile qui a déclenché le clic
+        """
+        sampled = blue_frame[::8, ::8]
+        reference = self.settle_signature
+        if reference is None or reference.shape != sampled.shape:
+            return True  # Rien à comparer : pas de second clic
+        diff = np.subtract(sampled, reference, out=self.scratch('settle_diff', reference.shape, np.int16))
+        return np.abs(diff, out=diff).mean() > self.settle_threshold
+    
+    def end_minigame(self, duration):
+        """Fin du mini-jeu (barre disparue) : durée enregistrée, filtres réinitialisés"""
+        self.get_tracking_stats().add_minigame(duration)
+        if self.tuner is not None:
+            self.tuner.on_minigame(duration, self.catch_complete, self.minigame_error_sum / max(1, self.minigame_ticks))
+        self.minigame_error_sum = 0.0
+        self.minigame_ticks = 0
+        self.minigame_progress = 0.0
+        self.long_minigame_dumped = False
+        self.predictive.reset()
+        self.reset_green_progress()
+    
+    def publish_telemetry(self, tick_rate, elapsed):
+        """Snapshot des métriques live pour le GUI, écrit en place dans le buffer du canal (aucune allocation, aucun accès Tk)"""
+        stats = self.telemetry.next_stats()
+        stages = stats['stages_ms']
+        means = self.tracer.recent_means(max(1, int(tick_rate * self.telemetry_interval))) if self.tracer is not None else None
+        if means is None:
+            stages.clear()
+        else:
+            for i, name in enumerate(self.tracer.stages):
+                stages[name] = float(means[i])
+            stages['tick'] = float(means[-1])
+        stats['state'] = self.pacer.state if self.pacer is not None else None
+        stats['tick_rate'] = tick_rate
+        stats['duty_cycle'] = self.last_duty_cycle
+        stats['distance'] = self.last_distance
+        stats['progress'] = self.green_fill / self.green_bar_height * 100
+        stats['catch_eta'] = self.catch_eta
+        stats['fish_count'] = self.fish_count
+        stats['fish_per_hour'] = self.session_fish / elapsed * 3600 if elapsed > 0 else 0.0
+        self.telemetry.commit_stats()
+    
+    def dump_trace(self, path=None):
+        """Exporte la trace par tick du run en cours (ou du dernier run)"""
+        if self.tracer is None:
+            print("⚠️ No trace available (tracing disabled or bot never started)")
+            return None
+        if path is None:
+            path = time.strftime("trace_%Y%m%d_%H%M%S.json")
+        self.tracer.dump(path)
+        return path
+    
     def should_click_v4(self, gray_y, white_y):
         """
         🚁 CONTRÔLE PROPORTIONNEL V4 - Système de duty cycle OPTIMISÉ
@@ -292,31 +719,19 @@ class GPOFishingBot:
         distance = gray_y - target_gray_y
         
         # CONTRÔLE OPTIMISÉ - Correction immédiate si trop haut
-        if distance > 150:
-            return True, "long", 128   # Très très loin : monter vite
-        elif distance > 100:
-            return True, "fast", 128   # Loin : monter contrôlé
-        elif distance > 80:
-            return True, "fast", 128 # Loin : monter contrôlé
-        elif distance > 50:
-            return True, "hover", 128  # Moyennement loin : ralentir progressivement
-        elif distance > 30:
-            return True, "hover", 40  # Moyennement loin : ralentir progressivement
-        elif distance > 1:
-            return True, "stable", 25 # Approche finale : stabilisation anticipée
-        else:
-            # distance <= 0 : TROP HAUT - Relâcher immédiatement !
-            return False, None, 0
-                    
+        for min_distance, click_type, duty_cycle in self.duty_table:
+            if distance > min_distance:
+                return True, click_type, duty_cycle
+        # distance <= 0 : TROP HAUT - Relâcher immédiatement !
+        return False, None, 0
     
     def run(self, debug=False):
-        self.sct = mss.mss()
-        
         print("\n" + "="*50)
         print("STARTING BOT V14 - OPTIMIZED CONTROL")
         print("="*50)
         
-        if not self.calibrated:
+        live = self.frame_source is None
+        if not self.calibrated and live and not self.auto_calibrate_on_start:
             print("❌ Not calibrated! Use calibration button first.")
             return
         
@@ -329,84 +744,241 @@ class GPOFishingBot:
         print("     • 18% = APPROACH (anticipate, +8 to +25px)")
         print("     • 20% = STABLE (target zone: 0 to +8px)")
         print("     • 0%  = RELEASE (below 0px - immediate correction!)")
-        print("\nPress F6 to stop")
-        print("Starting in 3 seconds...\n")
-        time.sleep(3)
+        if self.stop_hint:
+            print(f"\n{self.stop_hint}")
+        if self.start_delay:
+            print(f"Starting in {self.start_delay} seconds...\n")
+            time.sleep(self.start_delay)
+        
+        if live and self.auto_calibrate_on_start:
+            self.auto_calibrate()
+            if not self.calibrated:
+                print("❌ Not calibrated! Use calibration button first.")
+                return
+        
+        source = self.frame_source if self.frame_source is not None else MssFrameSource(self)
+        if self.pipelined:
+            source = ThreadedFrameSource(source)
+        if self.input is None:
+            self.input = PyAutoGuiInput()
+        if self.pwm_clicking:
+            if isinstance(self.input, PyAutoGuiInput):
+                self.input.pause = False
+            self.clicker = PWMClicker(self.input, self.click_interval)
+            self.clicker.start()
+        
+        if self.self_tuning:
+            self.tuner = OnlineTuner(self, self.tuning_path).load()
+        
+        if self.persist_stats:
+            self.session_store = SessionStore(self.stats_path, self.count_path).start()
+        
+        if live and self.drift_tracking:
+            self.drift_tracker = DriftTracker(self, self.drift_interval).start()
         
         self.running = True
         fps_counter = 0
-        fps_start = time.time()
+        fps_start = source.clock()
+        frame_age_sum = 0.0
+        skipped_start = 0
+        self.tracer = tracer = TickTracer() if self.tracing else None
+        
+        self.pacer = pacer = LoopPacer(source, self.tick_rates, self.cpu_budgets)
+        wait_print_time = None
+        
+        if self.flight_recording:
+            # Dimensionné pour flight_seconds de mini-jeu à la cadence cible
+            rate = pacer.tick_rates[MINIGAME] or DEFAULT_TICK_RATES[MINIGAME]
+            self.flight_recorder = FlightRecorder(int(self.flight_seconds * rate), self.flight_dir).start()
+        recorder = self.flight_recorder
+        
+        self.session_fish = 0
+        session_start = telemetry_start = source.clock()
+        telemetry_ticks = 0
+        self.telemetry.publish({'type': 'status', 'status': "Fishing..."})
         
         try:
             while self.running:
-                blue_frame = self.capture_blue_bar()
-                green_frame = self.capture_green_bar()
+                pacer.wait()
+                if self.pending_shifts:
+                    self.apply_pending_shifts()
                 
-                white_y = self.find_white_marker_y(blue_frame)
-                gray_y = self.find_gray_zone_y(blue_frame)
+                # Télémétrie GUI à cadence fixe, quel que soit l'état
+                telemetry_ticks += 1
+                now = source.clock()
+                if now - telemetry_start >= self.telemetry_interval:
+                    self.publish_telemetry(telemetry_ticks / (now - telemetry_start), now - session_start)
+                    telemetry_ticks = 0
+                    telemetry_start = now
+                
+                # Attente de la touche : sonde d'une colonne, détection complète seulement si la barre apparaît
+                if self.appearance_probe and pacer.state == WAITING:
+                    column = source.probe()
+                    if column is None:
+                        print("\n📼 Frame source exhausted")
+                        break
+                    now = source.clock()
+                    if self.probe_bar_visible(column):
+                        self.bar_seen_time = now
+                    elif now - self.bar_lost_time < 15 and wait_print_time is not None and now - wait_print_time < 3:
+                        continue
+                    # Sinon tick complet : affichage périodique et timeout de 15s
+                
+                if tracer is not None:
+                    tracer.begin_tick()
+                read_start = time.perf_counter()
+                frames = source.read()
+                if frames is None:
+                    print("\n📼 Frame source exhausted")
+                    break
+                blue_frame, green_frame = frames
+                frame_time = source.frame_time if source.frame_time is not None else read_start
+                if tracer is not None:
+                    tracer.mark('grab')
+                
+                if self.roi_tracking:
+                    white_y, gray_y = self.detect_blue_tracked(blue_frame)
+                else:
+                    white_y, gray_y = self.detect_blue_frame(blue_frame)
+                if tracer is not None:
+                    tracer.mark('blue_detect')
                 
                 # Reset restart variables when detection works
                 if white_y is not None and gray_y is not None:
                     self.bar_lost_time = None
                     self.click_sent_for_restart = False
-                progress = self.get_green_bar_progress(green_frame)
+                    self.cast_unconfirmed = False
+                progress = self.update_green_progress(green_frame, source.clock())
+                if tracer is not None:
+                    tracer.mark('green_progress')
+                if recorder is not None and pacer.state in self.flight_states:
+                    # Clic tel qu'appliqué au moment de la capture (décision du tick précédent)
+                    recorder.record(frame_time, blue_frame, green_frame, white_y, gray_y,
+                                    progress, self.last_duty_cycle, self.is_clicking)
                 
                 if white_y is None or gray_y is None:
-                    current_time = time.time()
-                    
-                    # After catching fish, wait a bit
-                    if self.just_caught_fish:
-                        if self.fish_caught_time and (current_time - self.fish_caught_time) < 3:
-                            time.sleep(0.5)
-                            continue
-                        else:
-                            self.just_caught_fish = False
+                    current_time = source.clock()
+                    if self.clicker is not None:
+                        self.clicker.set_command(0)
+                        self.is_clicking = False
+                    self.bar_seen_time = None
+                    self.last_duty_cycle = 0
+                    self.last_distance = None
+                    if pacer.state == MINIGAME:
+                        # Fin du mini-jeu : barre verte (quasi) pleine au dernier tick = canne prête plus tôt
+                        self.catch_complete = self.minigame_progress >= self.catch_progress
+                        if recorder is not None and not self.catch_complete:
+                            recorder.trigger("no_detection")
+                        self.end_minigame(current_time - pacer.state_since)
+                        self.cycle['end'] = current_time
                     
                     # Detection failed - rod not cast, restart fishing
                     if self.bar_lost_time is None:
                         self.bar_lost_time = current_time
+                        self.settle_signature = None
+                        wait_print_time = None
                         print("\n⚠️  No detection - Restarting fishing...")
                     
-                    # Wait 1 second before clicking to cast rod
+                    # Relance dès que la canne est prête après une capture, sinon après recast_delay
                     elapsed = current_time - self.bar_lost_time
-                    if not self.click_sent_for_restart and elapsed >= 1.0:
-                        # Incrémenter le compteur si ce n'est pas le premier lancer
-                        if not self.first_cast:
+                    if not self.click_sent_for_restart and (elapsed >= self.recast_delay or self.rod_ready(blue_frame, current_time)):
+                        # Compte chaque mini-jeu terminé (pas un lancer sans touche après timeout)
+                        if 'bite' in self.cycle:
                             self.fish_count += 1
+                            self.session_fish += 1
+                            self.recast_times.append(elapsed)
                             print(f"\n🎣 FISH CAUGHT! Total: {self.fish_count} 🎣")
                             self.save_fish_count()  # Sauvegarde
-                        else:
-                            self.first_cast = False
+                            self.record_cycle("caught")
+                        elif self.first_cast:
                             print("\n🎣 First cast - starting fishing...")
+                        self.first_cast = False
+                        self.catch_complete = False
                         
-                        pyautogui.click()
+                        self.input.click()
                         print("🖱️  Click sent to cast rod")
                         self.click_sent_for_restart = True
-                        time.sleep(0.5)
+                        self.cast_time = current_time
+                        self.cycle = {'start': self.bar_lost_time, 'cast': current_time}
+                        # Relance anticipée (canne seulement supposée prête) : le lancer doit se voir
+                        self.cast_unconfirmed = self.confirm_early_cast and elapsed < self.recast_delay
+                    elif self.cast_unconfirmed:
+                        if self.cast_seen(blue_frame):
+                            self.cast_unconfirmed = False
+                        elif current_time - self.cast_time >= self.cast_confirm_s and elapsed >= self.recast_delay:
+                            # Clic probablement ignoré (animation de prise pas finie) : second clic,
+                            # pas avant le délai fixe historique (sinon attente du timeout de 15s)
+                            self.input.click()
+                            print("🖱️  No cast seen after early recast - click sent again")
+                            self.cast_unconfirmed = False
+                            self.cast_time = current_time
+                            self.cycle['cast'] = current_time
+                            self.recast_retries += 1
+                    
+                    if tracer is not None:
+                        tracer.mark('input')
+                        tracer.end_tick()
                     
                     # Wait for bar to appear (max 15s after click)
                     if elapsed < 15:
-                        if elapsed % 3 < 0.5:  # Print every 3 seconds
+                        if not self.click_sent_for_restart:
+                            pacer.set_state(COOLDOWN)
+                        elif current_time - self.cast_time < 0.5 or self.cast_unconfirmed:
+                            pacer.set_state(CASTING)
+                        else:
+                            pacer.set_state(WAITING)
+                        if wait_print_time is None or current_time - wait_print_time >= 3:  # Print every 3 seconds
                             print(f"⏳ Waiting for bar... ({elapsed:.1f}s/15s)")
-                        time.sleep(0.5)
+                            wait_print_time = current_time
                         continue
                     else:
                         # Reset after 15s timeout
                         print("⚠️  15s timeout - Resetting...")
+                        if recorder is not None:
+                            recorder.trigger("timeout")
+                        if 'cast' in self.cycle and 'bite' not in self.cycle:
+                            self.cycle['end'] = current_time
+                            self.record_cycle("timeout")
+                        self.cycle = {}
                         self.bar_lost_time = None
                         self.click_sent_for_restart = False
-                        time.sleep(1)
+                        self.cast_unconfirmed = False
+                        pacer.set_state(IDLE)
                         continue
                 
+                if pacer.state != MINIGAME and 'bite' not in self.cycle:
+                    self.cycle['bite'] = source.clock()
+                pacer.set_state(MINIGAME)
+                self.minigame_progress = progress
+                if recorder is not None and not self.long_minigame_dumped and pacer.time_in_state() > self.long_minigame_s:
+                    recorder.trigger("long_minigame")
+                    self.long_minigame_dumped = True
+                
                 # === DÉCISION V4 AVEC DUTY CYCLE ===
-                should_click, click_type, duty_cycle = self.should_click_v4(gray_y, white_y)
-                current_time = time.time()
+                current_time = source.clock()
+                if self.controller == "predictive":
+                    self.predictive.target_offset = self.target_offset
+                    should_click, click_type, duty_cycle = self.predictive.update(
+                        gray_y, white_y, current_time, self.pipeline_latency + self.latency_extra)
+                else:
+                    should_click, click_type, duty_cycle = self.should_click_v4(gray_y, white_y)
+                self.last_distance = gray_y - (white_y - self.target_offset)
+                self.last_duty_cycle = duty_cycle if should_click else 0
+                self.get_tracking_stats().add_error(self.last_distance)
+                self.minigame_error_sum += abs(self.last_distance)
+                self.minigame_ticks += 1
+                if tracer is not None:
+                    tracer.mark('controller')
                 
-                if should_click:
+                if self.clicker is not None:
+                    # Le PWMClicker génère les fronts : on ne fait que transmettre la consigne
+                    self.clicker.set_command(duty_cycle if should_click else 0)
+                    self.is_clicking = self.clicker.pressed
+                elif should_click:
                     if click_type == "long":
                         # 100% duty cycle : clic maintenu
                         if not self.is_clicking:
-                            pyautogui.mouseDown()
+                            self.input.mouseDown()
                             self.is_clicking = True
                             self.last_click_time = current_time
                     else:
@@ -418,165 +990,109 @@ class GPOFishingBot:
                         
                         if not self.is_clicking:
                             if time_since_action >= release_duration:
-                                pyautogui.mouseDown()
+                                self.input.mouseDown()
                                 self.is_clicking = True
                                 self.last_action_time = current_time
                         else:
                             if time_since_action >= click_duration:
-                                pyautogui.mouseUp()
+                                self.input.mouseUp()
                                 self.is_clicking = False
                                 self.last_action_time = current_time
                 else:
                     if self.is_clicking:
-                        pyautogui.mouseUp()
+                        self.input.mouseUp()
                         self.is_clicking = False
                         self.last_action_time = current_time
                 
+                if tracer is not None:
+                    tracer.mark('input')
+                    tracer.end_tick()
+                
+                # Réactivité : apparition de la barre (sonde) -> premier clic
+                if self.bar_seen_time is not None and should_click:
+                    reaction = source.clock() - self.bar_seen_time
+                    self.reaction_times.append(reaction)
+                    self.bar_seen_time = None
+                    print(f"⚡ Bar appeared -> first click in {reaction * 1000:.1f}ms")
+                
+                # Latence capture -> clic (moyenne glissante, utilisée par le contrôleur prédictif)
+                frame_age = time.perf_counter() - frame_time
+                self.pipeline_latency += 0.05 * (frame_age - self.pipeline_latency)
+                if self.pipelined:
+                    frame_age_sum += frame_age
+                
                 # Affichage console simplifié (sans debug visuel)
                 fps_counter += 1
-                if time.time() - fps_start >= 1.0:
+                if source.clock() - fps_start >= 1.0:
                     mode_str = f"{click_type}({duty_cycle}%)" if click_type else "NONE"
                     dist_str = f"{gray_y - (white_y - self.target_offset):+.0f}px" if (white_y and gray_y) else "N/A"
-                    print(f"FPS: {fps_counter:2d} | Progress: {progress:5.1f}% | Click: {'YES' if self.is_clicking else 'NO '} | Mode: {mode_str:>14} | Dist: {dist_str:>6}")
+                    pipe_str = ""
+                    if self.clicker is not None:
+                        pwm = self.clicker.stats()
+                        pipe_str += f" | PWM: {pwm['achieved_duty']:4.1f}%/{pwm['requested_duty']:4.1f}% jitter p99 {pwm['jitter_p99_ms']:.2f}ms"
+                        self.clicker.reset_stats()
+                    if self.pipelined:
+                        pipe_str += f" | Age: {frame_age_sum / fps_counter * 1000:4.1f}ms | Skip: {source.frames_skipped - skipped_start:3d}"
+                        skipped_start = source.frames_skipped
+                        frame_age_sum = 0.0
+                    eta_str = f"{self.catch_eta:4.1f}s" if self.catch_eta is not None else " -- "
+                    print(f"FPS: {fps_counter:2d} | Progress: {progress:5.1f}% ETA {eta_str} | Click: {'YES' if self.is_clicking else 'NO '} | Mode: {mode_str:>14} | Dist: {dist_str:>6}{pipe_str}")
+                    if debug and tracer is not None:
+                        stages = tracer.summary(last=fps_counter)
+                        print("   " + " | ".join(f"{name} {stats['p50_ms']:.2f}/{stats['p95_ms']:.2f}ms" for name, stats in stages.items()))
                     fps_counter = 0
-                    fps_start = time.time()
+                    fps_start = source.clock()
         
         except KeyboardInterrupt:
             print("\n\n⚠️ Stop requested by user")
         finally:
+            if self.drift_tracker is not None:
+                self.drift_tracker.stop()
+                if self.drift_tracker.corrections:
+                    print(f"🧭 Drift: {len(self.drift_tracker.corrections)} corrections in {self.drift_tracker.checks} checks")
+                self.drift_tracker = None
+            if self.calibration_dirty:
+                self.save_calibration()
+                self.calibration_dirty = False
+            if self.clicker is not None:
+                self.clicker.stop()
+                self.clicker = None
+                self.is_clicking = False
             if self.is_clicking:
-                pyautogui.mouseUp()
+                self.input.mouseUp()
+            source.close()
+            if self.session_store is not None:
+                self.session_store.close()
+                self.session_store = None
+            if self.tuner is not None:
+                self.tuner.close()
+                self.tuner = None
+            if self.flight_recorder is not None:
+                self.flight_recorder.close()
+                self.flight_recorder = None
+            for name, stats in self.tracking_stats.items():
+                summary = stats.summary()
+                print(f"📏 {name}: |err| mean {summary['mean_abs_error']:.1f}px | RMS {summary['rms_error']:.1f}px | "
+                      f"p95 {summary['p95_abs_error']:.1f}px | in tol {summary['in_tolerance'] * 100:.0f}% | "
+                      f"{summary['minigames']} minigames, mean {summary['mean_minigame_s']:.1f}s")
+            if self.reaction_times:
+                reactions = np.array(self.reaction_times) * 1000
+                print(f"⚡ Reaction (bar -> first click): median {np.median(reactions):.1f}ms | max {reactions.max():.1f}ms | {len(reactions)} bites")
+            if self.recast_times:
+                recasts = np.array(self.recast_times) * 1000
+                retries = f" | {self.recast_retries} re-clicks" if self.confirm_early_cast else ""
+                print(f"🎣 Recast after catch: median {np.median(recasts):.0f}ms | max {recasts.max():.0f}ms | "
+                      f"{len(recasts)} fish (fixed delay {self.recast_delay * 1000:.0f}ms){retries}")
+            if self.roi_tracking and self.track_ticks:
+                banded = self.track_ticks - self.track_full_scans
+                print(f"🎯 ROI tracking: {banded / self.track_ticks * 100:.1f}% band scans | "
+                      f"{self.track_fallbacks} fallbacks ({self.track_fallbacks / self.track_ticks * 100:.1f}% of ticks)")
+            for state, stats in pacer.stats().items():
+                print(f"⏱️  {state:>8}: {stats['ticks']:6d} ticks | {stats['tick_rate']:6.1f} ticks/s | CPU {stats['cpu'] * 100:5.1f}%")
+            if tracer is not None and self.trace_path:
+                tracer.dump(self.trace_path)
             print("\n✅ Bot stopped")
 
-class BotGUI:
-    def __init__(self, bot):
-        self.bot = bot
-        self.running = False
-        self.bot_thread = None
-        
-        self.root = tk.Tk()
-        self.root.title("GPO Fishing Bot V14")
-        self.root.geometry("320x300")
-        self.root.resizable(False, False)
-        self.root.attributes('-topmost', True)
-        
-        style = ttk.Style()
-        style.configure('Big.TButton', font=('Arial', 12, 'bold'))
-        
-        main_frame = ttk.Frame(self.root, padding="20")
-        main_frame.pack(fill=tk.BOTH, expand=True)
-        
-        title_label = ttk.Label(main_frame, text="GPO Auto Fishing Bot", font=('Arial', 16, 'bold'))
-        title_label.pack(pady=5)
-        
-        version_label = ttk.Label(main_frame, text="V14 - Optimized Control", font=('Arial', 9, 'italic'))
-        version_label.pack(pady=2)
-        
-        self.status_label = ttk.Label(main_frame, text="Status: Stopped", font=('Arial', 10))
-        self.status_label.pack(pady=5)
-        
-        self.fish_label = ttk.Label(main_frame, text="Fish Caught: 0", font=('Arial', 12, 'bold'), foreground='green')
-        self.fish_label.pack(pady=5)
-        
-        self.cal_button = ttk.Button(main_frame, text="CALIBRATION (F7)", style='Big.TButton', state='disabled')
-        self.cal_button.pack(pady=5, fill=tk.X)
-        
-        self.start_button = ttk.Button(main_frame, text="START (F6)", style='Big.TButton', state='disabled')
-        self.start_button.pack(pady=5, fill=tk.X)
-        
-        self.exit_button = ttk.Button(main_frame, text="EXIT (Q)", command=self.exit_app, style='Big.TButton')
-        self.exit_button.pack(pady=5, fill=tk.X)
-        
-        if self.bot.load_calibration():
-            self.status_label.config(text="Status: Calibrated")
-        
-        # Charger le compteur de poissons
-        self.bot.load_fish_count()
-        self.fish_label.config(text=f"Fish Caught: {self.bot.fish_count}")
-        
-        self.root.bind('q', lambda e: self.exit_app())
-        self.root.bind('Q', lambda e: self.exit_app())
-        self.root.protocol("WM_DELETE_WINDOW", self.exit_app)
-        
-        try:
-            keyboard.add_hotkey('f6', self.start_bot, suppress=False)
-            keyboard.add_hotkey('f7', self.calibrate, suppress=False)
-            print("✅ Global hotkeys active: F6=Start/Stop, F7=Calibration")
-        except:
-            print("⚠️ Global hotkeys unavailable")
-        
-        # Démarre la mise à jour automatique du compteur de poissons
-        self.update_fish_count()
-    
-    def calibrate(self):
-        print("\n▶️ Starting calibration...")
-        self.status_label.config(text="Status: Calibrating...")
-        
-        def do_calibration():
-            if self.bot.manual_calibrate():
-                self.root.after(100, lambda: self.status_label.config(text="Status: Calibrated"))
-            else:
-                self.root.after(100, lambda: self.status_label.config(text="Status: Stopped"))
-        
-        threading.Thread(target=do_calibration, daemon=True).start()
-    
-
-    def update_fish_count(self):
-        if self.fish_label.winfo_exists():
-            self.fish_label.config(text=f"Fish Caught: {self.bot.fish_count}")
-        self.root.after(1000, self.update_fish_count)
-
-    def start_bot(self):
-        if not self.bot.calibrated:
-            print("⚠️ Please calibrate first!")
-            return
-        
-        if self.running:
-            print("\n⏸️ Stopping bot...")
-            self.bot.running = False
-            self.running = False
-            self.status_label.config(text="Status: Stopped")
-            self.start_button.config(text="START (F6)")
-        else:
-            print("\n▶️ Starting bot...")
-            
-            self.running = True
-            self.bot.running = True
-            self.status_label.config(text="Status: Fishing...")
-            self.start_button.config(text="STOP (F6)")
-            self.bot_thread = threading.Thread(target=self.run_bot_thread, daemon=True)
-            self.bot_thread.start()
-    
-    def run_bot_thread(self):
-        try:
-            self.bot.run(debug=False)
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            if self.status_label.winfo_exists():
-                self.status_label.config(text="Status: Error")
-        finally:
-            self.running = False
-            if self.start_button.winfo_exists():
-                self.start_button.config(text="START (F6)")
-            if self.status_label.winfo_exists() and self.status_label.cget("text") != "Status: Error":
-                self.status_label.config(text="Status: Stopped")
-    
-    def exit_app(self):
-        print("\n👋 Closing...")
-        self.bot.running = False
-        if self.bot.is_clicking:
-            pyautogui.mouseUp()
-        try:
-            keyboard.remove_hotkey('f6')
-            keyboard.remove_hotkey('f7')
-        except:
-            pass
-        self.root.quit()
-        self.root.destroy()
-    
-    def run(self):
-        self.root.mainloop()
-
 if __name__ == "__main__":
     print("\n" + "="*50)
     print("GPO AUTO FISHING BOT V14 - OPTIMIZED VERSION")
@@ -588,6 +1104,9 @@ if __name__ == "__main__":
     print("  • Reduced Duty Cycles (Better Control)")
     print("  • No Debug Window (Lighter)")
     
+    # GUI et hotkeys importés seulement ici (voir headless_bot.py pour un lancement sans GUI)
+    from bot_gui import BotGUI
+    
     bot = GPOFishingBot()
     gui = BotGUI(bot)
     gui.run()
\ No newline at end of file
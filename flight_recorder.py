@@ -0,0 +1,102 @@
+import os
+import queue
+import threading
+import time
+import numpy as np
+
+class FlightRecorder:
+    """
+    Boîte noire : les `capacity` derniers ticks en mémoire, écrits sur disque sur anomalie
+
+    Anneau préalloué (frames ROI bleue/verte, timestamp, sorties du détecteur,
+    progression, duty cycle et état du clic) : par tick, deux copies de frame
+    dans l'anneau et quelques scalaires, aucune allocation.
+    trigger() échange l'anneau plein contre un anneau de réserve (O(1)) et
+    confie l'ancien au thread d'écriture (.npz compressé, relisible par
+    ReplayFrameSource) ; l'anneau revient en réserve une fois écrit. Un
+    déclenchement pendant une écriture en cours est ignoré.
+    """
+    def __init__(self, capacity=480, out_dir='flight_dumps'):
+        self.capacity = capacity
+        self.out_dir = out_dir
+        self.ring = None
+        self.spare = None
+        self.count = 0
+        self.dumps = []
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._writer, daemon=True)
+        self.thread.start()
+        return self
+
+    def close(self):
+        """Termine les écritures en cours puis arrête le thread"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join(timeout=30.0)
+            self.thread = None
+
+    def make_ring(self, blue_shape, green_shape):
+        # np.full écrit chaque page : pas de défaut de page pendant les premiers ticks
+        n = self.capacity
+        return {
+            'blue': np.full((n,) + blue_shape, 0, np.uint8),
+            'green': np.full((n,) + green_shape, 0, np.uint8),
+            't': np.full(n, np.nan, np.float64),
+            'white_y': np.full(n, -1, np.int32),
+            'gray_y': np.full(n, -1, np.int32),
+            'progress': np.full(n, 0, np.float32),
+            'duty': np.full(n, 0, np.int16),
+            'clicking': np.full(n, False, np.bool_),
+        }
+
+    def record(self, t, blue_frame, green_frame, white_y, gray_y, progress, duty, clicking):
+        if self.ring is None:
+            # Préallocation au premier tick (dimensions réelles des frames)
+            self.ring = self.make_ring(blue_frame.shape, green_frame.shape)
+            self.spare = self.make_ring(blue_frame.shape, green_frame.shape)
+        ring = self.ring
+        i = self.count % self.capacity
+        np.copyto(ring['blue'][i], blue_frame)
+        np.copyto(ring['green'][i], green_frame)
+        ring['t'][i] = t
+        ring['white_y'][i] = -1 if white_y is None else white_y
+        ring['gray_y'][i] = -1 if gray_y is None else gray_y
+        ring['progress'][i] = progress
+        ring['duty'][i] = duty
+        ring['clicking'][i] = clicking
+        self.count += 1
+
+    def trigger(self, reason):
+        """Envoie les derniers ticks au thread d'écriture ; False si rien à écrire ou écriture déjà en cours"""
+        if self.ring is None or self.count == 0:
+            return False
+        if self.spare is None:
+            print(f"⚠️ Flight recorder busy, '{reason}' not dumped")
+            return False
+        ring, count = self.ring, self.count
+        self.ring, self.spare = self.spare, None
+        self.count = 0
+        self.queue.put((reason, time.strftime("%Y%m%d_%H%M%S"), ring, count))
+        return True
+
+    def _writer(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            reason, stamp, ring, count = item
+            try:
+                n = min(count, self.capacity)
+                order = np.arange(count - n, count) % self.capacity
+                os.makedirs(self.out_dir, exist_ok=True)
+                path = os.path.join(self.out_dir, f"flight_{stamp}_{reason}.npz")
+                np.savez_compressed(path, reason=reason, **{name: array[order] for name, array in ring.items()})
+                self.dumps.append(path)
+                print(f"\n🛩️ Flight recorder: {n} ticks before '{reason}' -> {path}")
+            except Exception as e:
+                print(f"⚠️ Flight recorder dump failed: {e}")
+            finally:
+                self.spare = ring
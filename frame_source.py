@@ -0,0 +1,330 @@
+import ast
+import os
+import struct
+import tempfile
+import time
+import threading
+import zipfile
+import numpy as np
+from timing import sleep_until
+
+class FrameSource:
+    """
+    Source de frames pour GPOFishingBot.run
+
+    read() retourne (blue_frame, green_frame) en BGR, ou None quand la source est épuisée.
+    clock() / sleep() / sleep_until() donnent le temps vu par la boucle
+    (horloge monotone en live, virtuelle en replay).
+    frame_time : perf_counter de la capture de la dernière frame lue, si la
+    source capture en avance (sinon None : l'instant du read() fait foi).
+    """
+    frame_time = None
+
+    def read(self):
+        raise NotImplementedError
+
+    def read_into(self, buffer):
+        """read() dans le buffer de frame n° buffer du bot, pour les sources qui en utilisent"""
+        return self.read()
+
+    def probe(self):
+        """Colonne centrale de la barre bleue (sonde d'apparition), None si épuisée"""
+        frames = self.read()
+        if frames is None:
+            return None
+        blue_frame = frames[0]
+        middle = blue_frame.shape[1] // 2
+        return blue_frame[:, middle:middle + 1]
+
+    def clock(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def sleep_until(self, deadline):
+        sleep_until(deadline, clock=self.clock)
+
+    def close(self):
+        pass
+
+class MssFrameSource(FrameSource):
+    """Capture live de la fenêtre du jeu via mss (comportement historique)"""
+    def __init__(self, bot):
+        self.bot = bot
+        # Nouvelle instance mss créée par le thread qui capture (handles liés au thread)
+        self.bot.sct = None
+
+    def read(self):
+        return self.read_into(0)
+
+    def read_into(self, buffer):
+        if self.bot.union_capture:
+            return self.bot.capture_bars(buffer)
+        return self.bot.capture_blue_bar(), self.bot.capture_green_bar()
+
+    def probe(self):
+        # Grab d'une seule colonne de pixels au lieu des deux barres
+        return self.bot.capture_probe_column()
+
+class ThreadedFrameSource(FrameSource):
+    """
+    Pipeline producteur/consommateur : un thread de capture écrit en continu
+    la paire de frames la plus récente dans un slot unique (écrasé à chaque frame)
+
+    read() attend une frame plus récente que la dernière lue et la retourne ;
+    les frames écrasées avant d'être lues sont comptées dans frames_skipped.
+    Frames capturées tour à tour dans BUFFERS buffers préalloués du bot : la
+    capture n'écrit jamais dans celui du slot ni dans celui en cours de traitement.
+    """
+    BUFFERS = 3
+
+    def __init__(self, source):
+        self.source = source
+        self.condition = threading.Condition()
+        self.slot = None
+        self.slot_buffer = None
+        self.read_buffer = None  # Buffer de la frame rendue par le dernier read() (en traitement)
+        self.slot_seq = 0
+        self.slot_time = None
+        self.last_seq = 0
+        self.exhausted = False
+        self.frames_captured = 0
+        self.frames_consumed = 0
+        self.frames_skipped = 0
+        self.frame_time = None  # perf_counter de la capture de la dernière frame lue
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.thread.start()
+
+    def _capture_loop(self):
+        try:
+            while not self.stop_event.is_set():
+                with self.condition:
+                    buffer = next(i for i in range(self.BUFFERS) if i != self.slot_buffer and i != self.read_buffer)
+                frames = self.source.read_into(buffer)
+                captured_at = time.perf_counter()
+                with self.condition:
+                    if frames is None:
+                        self.exhausted = True
+                        self.condition.notify_all()
+                        return
+                    self.slot = frames
+                    self.slot_buffer = buffer
+                    self.slot_time = captured_at
+                    self.slot_seq += 1
+                    self.frames_captured += 1
+                    self.condition.notify_all()
+        except Exception as e:
+            print(f"❌ Capture thread error: {e}")
+            with self.condition:
+                self.exhausted = True
+                self.condition.notify_all()
+
+    def clock(self):
+        return self.source.clock()
+
+    def sleep(self, seconds):
+        self.source.sleep(seconds)
+
+    def sleep_until(self, deadline):
+        self.source.sleep_until(deadline)
+
+    def read(self):
+        with self.condition:
+            while self.slot_seq == self.last_seq and not self.exhausted:
+                self.condition.wait()
+            if self.slot_seq == self.last_seq:
+                return None
+            self.frames_skipped += self.slot_seq - self.last_seq - 1
+            self.last_seq = self.slot_seq
+            self.frames_consumed += 1
+            self.frame_time = self.slot_time
+            self.read_buffer = self.slot_buffer
+            return self.slot
+
+    def close(self):
+        self.stop_event.set()
+        self.thread.join(timeout=1.0)
+        self.source.close()
+        print(f"🧵 Pipeline: {self.frames_captured} captured, {self.frames_consumed} processed, "
+              f"{self.frames_skipped} skipped")
+
+# Lecteurs d'en-tête .npy par version (comme np.load) ; la 3.0 (en-tête utf-8) n'a pas de lecteur public
+HEADER_READERS = {(1, 0): np.lib.format.read_array_header_1_0, (2, 0): np.lib.format.read_array_header_2_0}
+
+def read_npy_header(src):
+    """(shape, fortran_order, dtype) d'un flux .npy positionné au début, selon sa version"""
+    version = np.lib.format.read_magic(src)
+    if version in HEADER_READERS:
+        return HEADER_READERS[version](src)
+    if version == (3, 0):
+        length, = struct.unpack('<I', src.read(4))
+        header = ast.literal_eval(src.read(length).decode('utf8'))
+        return tuple(header['shape']), header['fortran_order'], np.lib.format.descr_to_dtype(header['descr'])
+    raise ValueError(f"Unsupported .npy format version {version}")
+
+def npz_to_directory(path, out_dir, block=1 << 22):
+    """
+    Décompresse un enregistrement .npz en dossier memory-mappé (blue.npy, green.npy, t.npy)
+
+    Copie par blocs de `block` octets depuis l'archive vers des .npy ouverts en
+    memory-map : la mémoire utilisée ne dépend pas de la taille de l'enregistrement.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    with zipfile.ZipFile(path) as archive:
+        for name in ('blue', 'green', 't'):
+            member = name + '.npy'
+            if member not in archive.namelist():
+                continue
+            with archive.open(member) as src:
+                shape, fortran_order, dtype = read_npy_header(src)
+                out = np.lib.format.open_memmap(os.path.join(out_dir, member), 'w+', dtype, shape, fortran_order)
+                raw = out.reshape(-1, order='A').view(np.uint8)
+                offset = 0
+                while offset < raw.size:
+                    data = src.read(min(block, raw.size - offset))
+                    if not data:
+                        raise ValueError(f"{path}: truncated {member}")
+                    raw[offset:offset + len(data)] = np.frombuffer(data, np.uint8)
+                    offset += len(data)
+                out.flush()
+                del raw, out
+    return out_dir
+
+def load_recording(path, fps=60.0, workdir=None):
+    """
+    Charge un enregistrement de frames ROI
+
+    - dossier contenant blue.npy, green.npy et t.npy (optionnel) : memory-mapped
+    - fichier .npz avec les clés 'blue', 'green' et 't' (optionnel) : décompressé
+      dans le dossier workdir puis memory-mapped ; sans workdir, chargé en RAM
+    Sans timestamps, les frames sont espacées de 1/fps.
+    Retourne: (blue, green, timestamps)
+    """
+    if not os.path.isdir(path) and workdir is not None:
+        path = npz_to_directory(path, workdir)
+    if os.path.isdir(path):
+        blue = np.load(os.path.join(path, 'blue.npy'), mmap_mode='r')
+        green = np.load(os.path.join(path, 'green.npy'), mmap_mode='r')
+        t_path = os.path.join(path, 't.npy')
+        timestamps = np.load(t_path) if os.path.exists(t_path) else None
+    else:
+        data = np.load(path)
+        blue = data['blue']
+        green = data['green']
+        timestamps = data['t'] if 't' in data.files else None
+    if timestamps is None:
+        timestamps = np.arange(len(blue)) / fps
+    return blue, green, np.asarray(timestamps, dtype=np.float64)
+
+def save_recording(path, blue, green, timestamps):
+    """Écrit un enregistrement au format dossier (relisible en memory-map)"""
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, 'blue.npy'), np.asarray(blue))
+    np.save(os.path.join(path, 'green.npy'), np.asarray(green))
+    np.save(os.path.join(path, 't.npy'), np.asarray(timestamps, dtype=np.float64))
+
+class ReplayFrameSource(FrameSource):
+    """
+    Rejoue un enregistrement sans fenêtre de jeu (build boxes, profiling)
+
+    realtime=True  : vitesse native, les frames arrivent à leur timestamp
+    realtime=False : aussi vite que le CPU le permet, avec une horloge virtuelle
+                     (les sleep() de la boucle sautent des frames au lieu d'attendre)
+    Un .npz est décompressé dans un dossier temporaire (memory-mapped, supprimé par close()).
+    """
+    def __init__(self, path, realtime=False, fps=60.0):
+        self.workdir = None if os.path.isdir(path) else tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.blue, self.green, self.timestamps = load_recording(path, fps, self.workdir and self.workdir.name)
+        self.realtime = realtime
+        self.index = 0
+        self.t0 = float(self.timestamps[0]) if len(self.timestamps) else 0.0
+        self.virtual_time = self.t0
+        self.start = None
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def clock(self):
+        if self.realtime and self.start is not None:
+            return self.t0 + (time.perf_counter() - self.start)
+        return self.virtual_time
+
+    def sleep(self, seconds):
+        if self.realtime:
+            time.sleep(seconds)
+        else:
+            self.virtual_time += seconds
+        self._drop_late_frames()
+
+    def sleep_until(self, deadline):
+        if self.realtime:
+            sleep_until(deadline, clock=self.clock)
+        else:
+            self.virtual_time = max(self.virtual_time, deadline)
+        self._drop_late_frames()
+
+    def _drop_late_frames(self):
+        # Les frames tombées pendant le sleep sont perdues, comme en live
+        while self.index < len(self.timestamps) - 1 and self.timestamps[self.index + 1] <= self.clock():
+            self.index += 1
+
+    def read(self):
+        if self.index >= len(self.blue):
+            return None
+        if self.start is None:
+            self.start = time.perf_counter()
+        frame_time = float(self.timestamps[self.index])
+        if self.realtime:
+            delay = frame_time - self.clock()
+            if delay > 0:
+                time.sleep(delay)
+        self.virtual_time = max(self.virtual_time, frame_time)
+        frames = self.blue[self.index], self.green[self.index]
+        self.index += 1
+        return frames
+
+    def close(self):
+        if self.workdir is not None:
+            # Memory-maps relâchées avant la suppression des .npy décompressés
+            self.blue = self.green = None
+            self.workdir.cleanup()
+            self.workdir = None
+
+class RecordingFrameSource(FrameSource):
+    """Enregistre les frames d'une autre source pour pouvoir les rejouer plus tard"""
+    def __init__(self, source, path):
+        self.source = source
+        self.path = path
+        self.blue = []
+        self.green = []
+        self.timestamps = []
+
+    def clock(self):
+        return self.source.clock()
+
+    def sleep(self, seconds):
+        self.source.sleep(seconds)
+
+    def sleep_until(self, deadline):
+        self.source.sleep_until(deadline)
+
+    def read(self):
+        return self.record(self.source.read())
+
+    def read_into(self, buffer):
+        return self.record(self.source.read_into(buffer))
+
+    def record(self, frames):
+        if frames is not None:
+            self.blue.append(frames[0].copy())
+            self.green.append(frames[1].copy())
+            self.timestamps.append(self.source.clock())
+        return frames
+
+    def close(self):
+        self.source.close()
+        if self.blue:
+            save_recording(self.path, self.blue, self.green, self.timestamps)
+            print(f"💾 Recording saved: {len(self.blue)} frames -> {self.path}")
@@ -0,0 +1,77 @@
+import time
+STARTUP = time.perf_counter()
+
+import argparse
+import json
+import signal
+import sys
+import threading
+import numpy as np
+from fishing_bot import GPOFishingBot
+
+def apply_settings(bot, settings):
+    """
+    Applique {"attribut": valeur, ...} sur les attributs de GPOFishingBot
+
+    Seuls les attributs existants sont acceptés (faute de frappe = erreur, pas un réglage ignoré).
+    """
+    for key, value in settings.items():
+        if not hasattr(bot, key):
+            raise ValueError(f"Unknown setting: {key}")
+        current = getattr(bot, key)
+        if isinstance(current, np.ndarray):
+            value = np.array(value, dtype=current.dtype)
+        setattr(bot, key, value)
+
+def load_config(bot, path):
+    """Applique un fichier de config JSON (voir apply_settings)"""
+    with open(path, 'r') as f:
+        config = json.load(f)
+    apply_settings(bot, config)
+    return config
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the fishing bot without GUI or global hotkeys")
+    parser.add_argument('--config', help="JSON file of GPOFishingBot settings")
+    parser.add_argument('--calibration', help="Calibration file (default: calibration.json)")
+    parser.add_argument('--position', type=int, nargs=2, metavar=('X', 'Y'), help="Blue bar top-left corner, overrides the calibration file")
+    parser.add_argument('--auto-calibrate', action='store_true', help="Search the blue bar on screen at start even if calibrated")
+    parser.add_argument('--duration', type=float, help="Stop after this many seconds")
+    parser.add_argument('--debug', action='store_true', help="Print per-stage latencies every second")
+    args = parser.parse_args()
+    imports_done = time.perf_counter()
+
+    bot = GPOFishingBot()
+    bot.start_delay = 0
+    if args.config:
+        load_config(bot, args.config)
+    if args.calibration:
+        bot.calibration_path = args.calibration
+    if args.position:
+        bot.set_bar_position(*args.position)
+        bot.calibrated = True
+    else:
+        bot.load_calibration()
+    # Calibration connue : pas de recherche plein écran au démarrage
+    bot.auto_calibrate_on_start = args.auto_calibrate or not bot.calibrated
+    bot.load_fish_count()
+
+    # Arrêt propre (clic relâché, stats écrites) sur SIGTERM d'un superviseur ou après --duration
+    def stop(*_):
+        bot.running = False
+    signal.signal(signal.SIGTERM, stop)
+    if args.duration:
+        timer = threading.Timer(args.duration, stop)
+        timer.daemon = True
+        timer.start()
+
+    bot.stop_hint = "Press Ctrl+C or send SIGTERM to stop" + (f" (auto stop after {args.duration:g}s)" if args.duration else "")
+
+    ready = time.perf_counter()
+    gui_loaded = [name for name in ('tkinter', 'keyboard', 'pyautogui') if name in sys.modules]
+    print(f"⚡ Startup: {(ready - STARTUP) * 1000:.0f}ms (imports {(imports_done - STARTUP) * 1000:.0f}ms, "
+          f"setup {(ready - imports_done) * 1000:.0f}ms) | GUI modules loaded: {', '.join(gui_loaded) or 'none'}")
+
+    bot.run(debug=args.debug)
+    if not bot.calibrated:
+        raise SystemExit(1)
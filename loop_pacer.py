@@ -0,0 +1,81 @@
+import time
+
+# États de la boucle de pêche
+IDLE = 'idle'            # rien à faire (timeout, reset)
+CASTING = 'casting'      # clic de lancer envoyé, animation de la canne
+WAITING = 'waiting'      # canne lancée, on attend la touche (apparition de la barre)
+MINIGAME = 'minigame'    # mini-jeu actif : contrôle de la zone grise
+COOLDOWN = 'cooldown'    # barre disparue (poisson attrapé), on guette la canne prête avant de relancer
+
+STATES = (IDLE, CASTING, WAITING, MINIGAME, COOLDOWN)
+
+# Fréquence cible par état (ticks/s, None = aussi vite que possible)
+# WAITING tourne vite : la sonde d'apparition ne coûte qu'une colonne de pixels
+DEFAULT_TICK_RATES = {IDLE: 1, CASTING: 10, WAITING: 100, MINIGAME: 120, COOLDOWN: 60}
+
+# Budget CPU par état (fraction d'un cœur, None = pas de limite)
+DEFAULT_CPU_BUDGETS = {IDLE: 0.02, CASTING: 0.05, WAITING: 0.10, MINIGAME: None, COOLDOWN: 0.05}
+
+class LoopPacer:
+    """
+    Cadence de la boucle selon l'état courant
+
+    wait() est appelé en début de tick : il dort (sleep hybride de la source)
+    jusqu'à l'échéance du tick suivant. La période est 1/fréquence de l'état,
+    allongée si besoin pour que le temps de travail reste sous le budget CPU.
+    """
+    def __init__(self, source, tick_rates=None, cpu_budgets=None):
+        self.source = source
+        self.tick_rates = dict(DEFAULT_TICK_RATES, **(tick_rates or {}))
+        self.cpu_budgets = dict(DEFAULT_CPU_BUDGETS, **(cpu_budgets or {}))
+        self.state = IDLE
+        self.state_since = source.clock()
+        self.tick_start = None
+        self.work_start = None
+        self.ticks = {state: 0 for state in STATES}
+        self.work_time = {state: 0.0 for state in STATES}
+        self.wall_time = {state: 0.0 for state in STATES}
+
+    def set_state(self, state):
+        if state != self.state:
+            self.state = state
+            self.state_since = self.source.clock()
+
+    def time_in_state(self):
+        return self.source.clock() - self.state_since
+
+    def wait(self):
+        """Attend le début du prochain tick et démarre sa mesure"""
+        if self.tick_start is not None:
+            state = self.state
+            work = time.perf_counter() - self.work_start
+            rate = self.tick_rates.get(state)
+            budget = self.cpu_budgets.get(state)
+            period = 1.0 / rate if rate else 0.0
+            if budget:
+                period = max(period, work / budget)
+            deadline = self.tick_start + period
+            if deadline > self.source.clock():
+                self.source.sleep_until(deadline)
+            now = self.source.clock()
+            self.ticks[state] += 1
+            self.work_time[state] += work
+            self.wall_time[state] += now - self.tick_start
+            # En retard : on repart de maintenant au lieu de rattraper en rafale
+            self.tick_start = deadline if now - deadline < period else now
+        else:
+            self.tick_start = self.source.clock()
+        self.work_start = time.perf_counter()
+
+    def stats(self):
+        """Par état : fréquence obtenue (ticks/s) et charge CPU (fraction d'un cœur)"""
+        result = {}
+        for state in STATES:
+            wall = self.wall_time[state]
+            if self.ticks[state]:
+                result[state] = {
+                    'ticks': self.ticks[state],
+                    'tick_rate': self.ticks[state] / wall if wall > 0 else 0.0,
+                    'cpu': self.work_time[state] / wall if wall > 0 else 0.0,
+                }
+        return result
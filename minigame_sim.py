@@ -0,0 +1,267 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from predictive_control import V4_DUTY_TABLE, build_duty_table
+
+# Paramètres physiques du mini-jeu (px, s, % de progression)
+DEFAULT_PARAMS = {
+    'bar_height': 400,        # Hauteur de la barre bleue
+    'zone_height': 80,        # Hauteur de la zone grise (le marqueur doit être dedans)
+    'press_accel': -1800.0,   # Accélération de la zone grise clic maintenu (vers le haut)
+    'release_accel': 1200.0,  # Accélération clic relâché (vers le bas)
+    'drag': 3.0,              # Frottement (1/s)
+    'max_speed': 600.0,       # Vitesse max de la zone grise (px/s)
+    'marker_speed': 120.0,    # Vitesse du marqueur blanc (px/s)
+    'marker_retarget': 0.8,   # Durée moyenne avant changement de cible du marqueur (s)
+    'fill_rate': 25.0,        # Remplissage de la barre verte, marqueur dans la zone (%/s)
+    'drain_rate': 15.0,       # Vidage hors zone (%/s)
+    'start_progress': 30.0,   # Progression au début du mini-jeu (%)
+    'tick_rate': 60.0,        # Fréquence du contrôleur (ticks/s)
+    'latency': 0.03,          # Latence capture -> effet du clic (s)
+    'physics_rate': 240.0,    # Pas de simulation (Hz)
+    'max_time': 60.0,         # Abandon après (s)
+}
+
+# Configuration de référence : réglages actuels de GPOFishingBot
+V4_CONFIG = {'target_offset': 40, 'click_interval': 0.1, 'duty_table': [list(row) for row in V4_DUTY_TABLE]}
+
+def simulate(config, params=None, episodes=32, seed=0):
+    """
+    Simule `episodes` mini-jeux en parallèle (vectorisé) avec un contrôleur de type V4
+
+    Même logique de clic que GPOFishingBot.run (palier "long" = maintenu, sinon
+    micro-clics sur click_interval). Déterministe pour un seed donné : toutes les
+    configurations voient les mêmes trajectoires du marqueur.
+    Retourne: dict avec time_to_catch moyen, failure_rate, erreur de suivi moyenne
+    """
+    p = dict(DEFAULT_PARAMS, **(params or {}))
+    rng = np.random.default_rng(seed)
+    dt = 1.0 / p['physics_rate']
+    steps = int(p['max_time'] / dt)
+    tick_every = max(1, int(round(p['physics_rate'] / p['tick_rate'])))
+    delay = int(round(p['latency'] / dt))
+    lowest = p['bar_height'] - p['zone_height']
+
+    thresholds = np.array([row[0] for row in config['duty_table']], np.float64)
+    duties = np.array([row[2] for row in config['duty_table']], np.float64)
+    is_long = np.array([row[1] == "long" for row in config['duty_table']])
+    target_offset = config['target_offset']
+    interval = config['click_interval']
+
+    gray = rng.uniform(0, lowest, episodes)
+    gray_speed = np.zeros(episodes)
+    marker = rng.uniform(20, p['bar_height'] - 20, episodes)
+    marker_target = rng.uniform(20, p['bar_height'] - 20, episodes)
+    retarget_at = rng.exponential(p['marker_retarget'], episodes)
+    progress = np.full(episodes, p['start_progress'])
+    pressed = np.zeros(episodes, bool)
+    last_action = np.full(episodes, -1.0)
+    done = np.zeros(episodes, bool)
+    caught = np.zeros(episodes, bool)
+    finish_time = np.full(episodes, p['max_time'])
+    history = np.zeros((delay + 1, 2, episodes))
+    error_sum = np.zeros(episodes)
+    error_count = np.zeros(episodes)
+
+    for step in range(steps):
+        t = step * dt
+        history[step % (delay + 1)] = gray, marker
+
+        # Contrôleur : observe l'état d'il y a `latency` secondes
+        if step % tick_every == 0:
+            seen_gray, seen_marker = history[(step - delay) % (delay + 1)] if step >= delay else (gray, marker)
+            distance = seen_gray - (seen_marker - target_offset)
+            active = ~done
+            error_sum[active] += np.abs(distance[active])
+            error_count[active] += 1
+
+            above = distance[None, :] > thresholds[:, None]
+            want = above.any(axis=0)
+            band = above.argmax(axis=0)
+            duty = np.where(want, duties[band], 0.0)
+            hold = want & is_long[band]
+            click_duration = interval * duty / 100.0
+            since = t - last_action
+            press = want & ~pressed & (hold | (since >= interval - click_duration))
+            release = pressed & ~hold & (~want | (since >= click_duration))
+            pressed = (pressed | press) & ~release
+            last_action = np.where(press | release, t, last_action)
+
+        # Zone grise
+        accel = np.where(pressed, p['press_accel'], p['release_accel']) - p['drag'] * gray_speed
+        gray_speed = np.clip(gray_speed + accel * dt, -p['max_speed'], p['max_speed'])
+        gray = gray + gray_speed * dt
+        blocked = (gray < 0) | (gray > lowest)
+        gray = np.clip(gray, 0, lowest)
+        gray_speed[blocked] = 0.0
+
+        # Marqueur blanc : va vers une cible qui change aléatoirement
+        retarget = t >= retarget_at
+        if retarget.any():
+            n = int(retarget.sum())
+            marker_target[retarget] = rng.uniform(20, p['bar_height'] - 20, n)
+            retarget_at[retarget] = t + rng.exponential(p['marker_retarget'], n)
+        gap = marker_target - marker
+        marker = marker + np.sign(gap) * np.minimum(np.abs(gap), p['marker_speed'] * dt)
+
+        # Barre verte
+        in_zone = (marker >= gray) & (marker <= gray + p['zone_height'])
+        progress = np.where(done, progress, progress + np.where(in_zone, p['fill_rate'], -p['drain_rate']) * dt)
+        finished = ~done & ((progress >= 100) | (progress <= 0))
+        if finished.any():
+            caught |= finished & (progress >= 100)
+            finish_time[finished] = t
+            done |= finished
+            if done.all():
+                break
+
+    catch_times = finish_time[caught]
+    return {
+        'time_to_catch': float(catch_times.mean()) if len(catch_times) else float('inf'),
+        'failure_rate': float(1.0 - caught.mean()),
+        'mean_abs_error': float((error_sum / np.maximum(error_count, 1)).mean()),
+    }
+
+def fit_params(paths, max_frames=None):
+    """
+    Ajuste les paramètres physiques sur des sessions enregistrées (voir frame_source)
+
+    Détecte zone grise / marqueur / progression sur chaque frame puis estime :
+    accélérations clic/relâché (percentiles de l'accélération de la zone grise),
+    vitesse et fréquence de changement de direction du marqueur, remplissage / vidage.
+    """
+    from fishing_bot import GPOFishingBot
+    from frame_source import load_recording
+
+    bot = GPOFishingBot()
+    accels, marker_speeds, fills, drains, extents = [], [], [], [], []
+    marker_turns, marker_time = 0, 0.0
+    for path in paths:
+        blue, green, timestamps = load_recording(path)
+        count = len(blue) if max_frames is None else min(len(blue), max_frames)
+        gray_y = np.full(count, np.nan)
+        white_y = np.full(count, np.nan)
+        progress = np.zeros(count)
+        for i in range(count):
+            white_rows, gray_rows = bot.blue_row_profiles(np.ascontiguousarray(blue[i]))
+            white, gray = bot.positions_from_profiles(white_rows, gray_rows)
+            if white is not None and gray is not None:
+                white_y[i], gray_y[i] = white, gray
+                extents.append(np.count_nonzero(gray_rows >= 15))
+            progress[i] = bot.get_green_bar_progress(np.ascontiguousarray(green[i]))
+
+        t = timestamps[:count]
+        dt = np.diff(t)
+        valid = ~np.isnan(gray_y[:-1]) & ~np.isnan(gray_y[1:]) & (dt > 0)
+        gray_speed = np.where(valid, np.diff(gray_y) / np.where(dt > 0, dt, 1), np.nan)
+        accel = np.diff(gray_speed) / np.where(dt[1:] > 0, dt[1:], 1)
+        accels.extend(accel[~np.isnan(accel)])
+        marker_speed = np.where(valid, np.diff(white_y) / np.where(dt > 0, dt, 1), np.nan)
+        moving = marker_speed[~np.isnan(marker_speed)]
+        moving = moving[np.abs(moving) > 1e-6]
+        marker_speeds.extend(np.abs(moving))
+        marker_turns += int(np.count_nonzero(np.diff(np.sign(moving)) != 0))
+        marker_time += float(dt[valid].sum())
+        slope = np.diff(progress) / np.where(dt > 0, dt, 1)
+        slope = slope[valid]
+        fills.extend(slope[slope > 0])
+        drains.extend(-slope[slope < 0])
+
+    fitted = dict(DEFAULT_PARAMS)
+    if len(accels) > 10:
+        fitted['press_accel'] = float(np.percentile(accels, 10))
+        fitted['release_accel'] = float(np.percentile(accels, 90))
+    if marker_speeds:
+        fitted['marker_speed'] = float(np.percentile(marker_speeds, 75))
+    if marker_turns:
+        fitted['marker_retarget'] = marker_time / marker_turns
+    if fills:
+        fitted['fill_rate'] = float(np.median(fills))
+    if drains:
+        fitted['drain_rate'] = float(np.median(drains))
+    if extents:
+        fitted['zone_height'] = float(np.median(extents))
+    return fitted
+
+def make_configs(target_offsets, click_intervals, hover_duties, stable_duties, band_scales):
+    """Grille de configurations V4 : offset, intervalle, duty des paliers hover/stable, échelle des paliers"""
+    configs = []
+    for offset, interval, hover, stable, scale in itertools.product(
+            target_offsets, click_intervals, hover_duties, stable_duties, band_scales):
+        configs.append({'target_offset': offset, 'click_interval': interval,
+                        'duty_table': build_duty_table(hover, stable, scale)})
+    return configs
+
+def _evaluate(job):
+    config, params, episodes, seed = job
+    return config, simulate(config, params, episodes, seed)
+
+def sweep(configs, params=None, episodes=32, seed=0, workers=None):
+    """Évalue toutes les configurations sur un pool de processus, classées (échecs puis temps de capture)"""
+    jobs = [(config, params, episodes, seed) for config in configs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(_evaluate, jobs, chunksize=max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))))
+    results.sort(key=lambda item: (item[1]['failure_rate'], item[1]['time_to_catch']))
+    return results
+
+def frange(start, stop, step):
+    return [round(v, 4) for v in np.arange(start, stop + step / 2, step)]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fishing minigame simulator and controller parameter sweeps")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    fit = sub.add_parser('fit', help="Fit simulator parameters from recorded sessions")
+    fit.add_argument('recordings', nargs='+')
+    fit.add_argument('--out', default='sim_params.json')
+
+    run = sub.add_parser('sweep', help="Rank controller configurations by simulated time-to-catch")
+    run.add_argument('--params', help="Fitted parameters (JSON from 'fit')")
+    run.add_argument('--episodes', type=int, default=32)
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--workers', type=int, default=None)
+    run.add_argument('--top', type=int, default=15)
+    run.add_argument('--out', default='sweep_results.csv')
+    args = parser.parse_args()
+
+    if args.command == 'fit':
+        fitted = fit_params(args.recordings)
+        with open(args.out, 'w') as f:
+            json.dump(fitted, f, indent=2)
+        print(json.dumps(fitted, indent=2))
+        print(f"\n💾 Parameters saved to {args.out}")
+    else:
+        params = None
+        if args.params:
+            with open(args.params, 'r') as f:
+                params = json.load(f)
+        configs = make_configs(
+            target_offsets=frange(20, 60, 5),
+            click_intervals=frange(0.05, 0.2, 0.05),
+            hover_duties=frange(20, 60, 10),
+            stable_duties=frange(10, 35, 5),
+            band_scales=(0.75, 1.0, 1.25),
+        )
+        print(f"🧪 Sweeping {len(configs)} configurations x {args.episodes} episodes...")
+        baseline = simulate(V4_CONFIG, params, args.episodes, args.seed)
+        results = sweep(configs, params, args.episodes, args.seed, args.workers)
+
+        with open(args.out, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['rank', 'time_to_catch', 'failure_rate', 'mean_abs_error', 'target_offset', 'click_interval', 'duty_table'])
+            for rank, (config, result) in enumerate(results, 1):
+                writer.writerow([rank, f"{result['time_to_catch']:.3f}", f"{result['failure_rate']:.3f}",
+                                 f"{result['mean_abs_error']:.2f}", config['target_offset'], config['click_interval'],
+                                 json.dumps(config['duty_table'])])
+
+        print(f"\nV4 baseline: {baseline['time_to_catch']:.2f}s to catch | {baseline['failure_rate'] * 100:.1f}% failures")
+        print(f"\n{'#':>3} {'catch':>7} {'fail':>6} {'offset':>7} {'interval':>9}  duties (hover/stable)")
+        for rank, (config, result) in enumerate(results[:args.top], 1):
+            duties = "/".join(str(row[2]) for row in config['duty_table'] if row[1] in ("hover", "stable") and row[2] < 100)
+            print(f"{rank:3d} {result['time_to_catch']:6.2f}s {result['failure_rate'] * 100:5.1f}% "
+                  f"{config['target_offset']:7} {config['click_interval']:9.2f}  {duties}")
+        print(f"\n💾 Full ranking saved to {args.out}")
@@ -0,0 +1,344 @@
+import argparse
+import contextlib
+import io
+import json
+import threading
+import time
+import cv2
+import numpy as np
+from fishing_bot import GPOFishingBot
+from frame_source import FrameSource
+from bot_input import MouseArbiter, PyAutoGuiInput, RecordingInput
+from headless_bot import apply_settings, load_config
+from loop_pacer import MINIGAME
+from timing import sleep_until
+
+def union_region(regions):
+    """Boîte englobante d'une liste de régions mss"""
+    left = min(r['left'] for r in regions)
+    top = min(r['top'] for r in regions)
+    right = max(r['left'] + r['width'] for r in regions)
+    bottom = max(r['top'] + r['height'] for r in regions)
+    return {"top": top, "left": left, "width": right - left, "height": bottom - top}
+
+class SharedCapture:
+    """
+    Un seul grab par tick pour toutes les instances
+
+    Un thread de capture grabe à `fps` la boîte englobante des capture_region
+    de toutes les bots (recalculée à chaque grab : suit un changement de
+    calibration d'une instance ; pas de DriftTracker dans les instances
+    supervisées, leur source n'étant pas live) et publie la frame BGRA brute dans un slot unique. Chaque
+    SharedFrameSource y découpe et convertit sa propre zone, dans le thread de
+    sa bot : la conversion couleur est répartie entre les instances.
+
+    grab(region) -> ndarray BGRA ; None = mss, créé dans le thread de capture.
+    """
+    def __init__(self, bots, fps=120.0, grab=None):
+        self.bots = bots
+        self.fps = fps
+        self.grab = grab
+        self.condition = threading.Condition()
+        self.frame = None
+        self.region = None
+        self.seq = 0
+        self.frame_time = None
+        self.stopped = False
+        self.frames_captured = 0
+        self.grab_time = 0.0
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def _loop(self):
+        grab = self.grab
+        if grab is None:
+            import mss
+            sct = mss.mss()
+            grab = lambda region: np.asarray(sct.grab(region))
+        period = 1.0 / self.fps
+        deadline = time.perf_counter()
+        try:
+            while not self.stopped:
+                region = union_region([bot.capture_region for bot in self.bots])
+                start = time.perf_counter()
+                frame = grab(region)
+                captured_at = time.perf_counter()
+                with self.condition:
+                    # Nouvelle frame = nouvel objet : les lecteurs gardent leur vue sur l'ancienne
+                    self.frame = frame
+                    self.region = region
+                    self.frame_time = captured_at
+                    self.seq += 1
+                    self.frames_captured += 1
+                    self.condition.notify_all()
+                self.grab_time += captured_at - start
+                # Seul ce thread fait de l'attente active : les bots bloquent sur la condition
+                deadline = max(deadline + period, captured_at)
+                sleep_until(deadline)
+        except Exception as e:
+            print(f"❌ Shared capture error: {e}")
+        finally:
+            with self.condition:
+                self.stopped = True
+                self.condition.notify_all()
+
+    def wait_frame(self, last_seq):
+        """Attend une frame plus récente que last_seq : (seq, frame, region, frame_time) ou None si arrêté"""
+        with self.condition:
+            while self.seq == last_seq and not self.stopped:
+                self.condition.wait()
+            if self.stopped:
+                return None
+            return self.seq, self.frame, self.region, self.frame_time
+
+class SharedFrameSource(FrameSource):
+    """Frames d'une instance découpées dans le grab partagé de SharedCapture"""
+    def __init__(self, capture, bot):
+        self.capture = capture
+        self.bot = bot
+        self.last_seq = 0
+        self.frames_consumed = 0
+        self.frames_skipped = 0
+
+    def next_frame(self):
+        shared = self.capture.wait_frame(self.last_seq)
+        if shared is None:
+            return None
+        seq, frame, region, frame_time = shared
+        if self.last_seq:
+            self.frames_skipped += seq - self.last_seq - 1
+        self.last_seq = seq
+        self.frames_consumed += 1
+        self.frame_time = frame_time
+        return frame, region
+
+    def read(self):
+        shared = self.next_frame()
+        if shared is None:
+            return None
+        frame, region = shared
+        own = self.bot.capture_region
+        top, left = own['top'] - region['top'], own['left'] - region['left']
+        roi = frame[top:top + own['height'], left:left + own['width']]
+        # Consommé par ce thread de bot avant la lecture suivante : un seul buffer suffit
+        bgr = cv2.cvtColor(roi, cv2.COLOR_BGRA2BGR, dst=self.bot.frame_buffer())
+        return bgr[self.bot.blue_slice], bgr[self.bot.green_slice]
+
+    def probe(self):
+        # Colonne BGRA brute, même format que GPOFishingBot.capture_probe_column
+        shared = self.next_frame()
+        if shared is None:
+            return None
+        frame, region = shared
+        probe = self.bot.probe_region
+        top, left = probe['top'] - region['top'], probe['left'] - region['left']
+        return frame[top:top + probe['height'], left:left + 1]
+
+    def sleep_until(self, deadline):
+        # Pas d'attente active dans les N threads de bot : la cadence vient de la capture
+        sleep_until(deadline, spin=0.0)
+
+class BotSupervisor:
+    """
+    Héberge N GPOFishingBot dans un seul process
+
+    Un thread par bot (détection + contrôle ; OpenCV relâche le GIL), un seul
+    grab partagé par tick. Il n'y a qu'un curseur et un bouton de souris pour
+    tout l'OS : les instances cliquent chacune à leur tour via `arbiter`
+    (MouseArbiter, démarré et arrêté avec les bots). Équité : toutes les
+    instances reçoivent la même séquence de frames au même rythme, aucune ne
+    peut accaparer la capture ; les frames sautées par une instance trop
+    lente sont comptées.
+    """
+    def __init__(self, bots, fps=120.0, grab=None, arbiter=None):
+        self.bots = bots
+        self.capture = SharedCapture(bots, fps, grab)
+        self.arbiter = arbiter
+        self.sources = []
+        self.threads = []
+
+    def start(self):
+        for bot in self.bots:
+            if not bot.calibrated:
+                raise ValueError("Every instance must be calibrated before starting the supervisor")
+        if self.arbiter is not None:
+            self.arbiter.start()
+        self.capture.start()
+        for bot in self.bots:
+            source = SharedFrameSource(self.capture, bot)
+            bot.frame_source = source
+            bot.start_delay = 0
+            self.sources.append(source)
+            thread = threading.Thread(target=bot.run, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def stop(self):
+        for bot in self.bots:
+            bot.running = False
+        self.capture.stop()
+        for thread in self.threads:
+            thread.join(timeout=2.0)
+        self.threads = []
+        if self.arbiter is not None:
+            # Après les bots : leur dernier mouseUp est appliqué ou le bouton relâché
+            self.arbiter.stop()
+
+    def stats(self):
+        """Par instance : ticks/s du mini-jeu et frames sautées ; équité (indice de Jain) des débits"""
+        rates = []
+        instances = []
+        for bot, source in zip(self.bots, self.sources):
+            pacer_stats = bot.pacer.stats() if bot.pacer is not None else {}
+            rate = pacer_stats.get(MINIGAME, {}).get('tick_rate', 0.0)
+            rates.append(rate)
+            instances.append({'tick_rate': rate, 'frames': source.frames_consumed, 'skipped': source.frames_skipped})
+        rates = np.array(rates, np.float64)
+        fairness = float(rates.sum() ** 2 / (len(rates) * (rates ** 2).sum())) if rates.any() else 0.0
+        return {'instances': instances, 'fairness': fairness,
+                'frames_captured': self.capture.frames_captured,
+                'grab_ms': self.capture.grab_time / max(1, self.capture.frames_captured) * 1000}
+
+def make_instance(spec, index, arbiter):
+    """
+    Une instance depuis sa description JSON :
+    {"calibration": "cal_1.json" | "position": [x, y], "input_position": [x, y],
+     "config": "bot_1.json", "settings": {...}}
+    Compteur, stats et boîte noire par instance (fish_count_<index>.json, sessions_<index>.jsonl,
+    flight_dumps_<index>) sauf réglage explicite.
+    Les clics passent par `arbiter` : souris de l'OS déplacée en input_position
+    (par défaut le centre de la barre bleue, dans la fenêtre de l'instance) à son tour.
+    """
+    bot = GPOFishingBot()
+    bot.count_path = f'fish_count_{index}.json'
+    bot.stats_path = f'sessions_{index}.jsonl'
+    bot.flight_dir = f'flight_dumps_{index}'
+    if 'config' in spec:
+        load_config(bot, spec['config'])
+    apply_settings(bot, spec.get('settings', {}))
+    if 'calibration' in spec:
+        bot.calibration_path = spec['calibration']
+    if 'position' in spec:
+        bot.set_bar_position(*spec['position'])
+        bot.calibrated = True
+    else:
+        bot.load_calibration()
+    position = spec.get('input_position')
+    if position is None and bot.blue_bar:
+        position = (bot.blue_bar['left'] + bot.blue_bar['width'] // 2, bot.blue_bar['top'] + bot.blue_bar['height'] // 2)
+    # Pas de pause pyautogui : le thread de l'arbitre sert toutes les instances
+    bot.input = arbiter.input(PyAutoGuiInput(pause=False, position=position))
+    return bot
+
+def make_instances(specs, arbiter):
+    """Instances d'une liste de descriptions, qui partagent la souris via arbiter"""
+    return [make_instance(spec, i, arbiter) for i, spec in enumerate(specs)]
+
+def synthetic_grab(bots, count=64, seed=0):
+    """Grab simulé : écran noir avec les barres synthétiques de chaque instance à sa position"""
+    from bench_bot import make_blue_frame, make_green_frame, make_trajectory
+    region = union_region([bot.capture_region for bot in bots])
+    screens = []
+    for gray_y, white_y, progress in make_trajectory(count, seed):
+        screen = np.zeros((region['height'], region['width'], 4), np.uint8)
+        for bot in bots:
+            for bar, frame in ((bot.blue_bar, make_blue_frame(gray_y, white_y)), (bot.green_bar, make_green_frame(progress))):
+                top, left = bar['top'] - region['top'], bar['left'] - region['left']
+                screen[top:top + bar['height'], left:left + bar['width'], :3] = frame
+        screens.append(screen)
+    index = [0]
+
+    def grab(_region):
+        index[0] = (index[0] + 1) % len(screens)
+        return screens[index[0]].copy()  # Copie : un buffer neuf par grab, comme mss
+    return grab
+
+def scaling_report(counts, seconds, fps):
+    """Débit par instance en fonction de N, sur frames synthétiques (aucune capture écran)"""
+    results = []
+    for n in counts:
+        bots = []
+        for i in range(n):
+            bot = GPOFishingBot()
+            bot.persist_stats = False
+            bot.flight_recording = False
+            bot.tracing = False
+            bot.set_bar_position(100 + i * 120, 100)
+            bot.calibrated = True
+            bot.input = RecordingInput()
+            bots.append(bot)
+        supervisor = BotSupervisor(bots, fps, synthetic_grab(bots))
+        # Les bots affichent leurs lignes FPS chaque seconde : muettes pendant la mesure
+        with contextlib.redirect_stdout(io.StringIO()):
+            supervisor.start()
+            time.sleep(seconds)
+            supervisor.stop()
+        stats = supervisor.stats()
+        rates = [instance['tick_rate'] for instance in stats['instances']]
+        skipped = sum(instance['skipped'] for instance in stats['instances'])
+        frames = sum(instance['frames'] for instance in stats['instances'])
+        results.append({'instances': n, 'mean_tick_rate': float(np.mean(rates)), 'min_tick_rate': float(np.min(rates)),
+                        'total_tick_rate': float(np.sum(rates)), 'fairness': stats['fairness'],
+                        'skipped': skipped / max(1, frames + skipped), 'grab_ms': stats['grab_ms']})
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run several bots from one process with a single shared screen grab. "
+                                     "The OS has one mouse: instances take turns clicking in their own window "
+                                     "(input_position), a waiting instance clicks once the other releases the mouse")
+    parser.add_argument('instances', nargs='?', help="JSON list of instance descriptions")
+    parser.add_argument('--fps', type=float, default=120.0, help="Shared capture rate")
+    parser.add_argument('--duration', type=float, help="Stop after this many seconds")
+    parser.add_argument('--scaling', type=int, nargs='+', metavar='N', help="Report per-instance tick rate for N synthetic instances")
+    parser.add_argument('--seconds', type=float, default=3.0, help="Measurement time per N for --scaling")
+    args = parser.parse_args()
+
+    if args.scaling:
+        results = scaling_report(args.scaling, args.seconds, args.fps)
+        print("\nSynthetic frames: capture split + detection + control decisions, no input sent")
+        print(f"\n{'N':>3} {'ticks/s/inst':>13} {'min':>7} {'total':>8} {'fairness':>9} {'skipped':>8} {'grab':>8}")
+        print("-" * 62)
+        for r in results:
+            print(f"{r['instances']:3d} {r['mean_tick_rate']:13.1f} {r['min_tick_rate']:7.1f} {r['total_tick_rate']:8.0f} "
+                  f"{r['fairness']:9.3f} {r['skipped'] * 100:7.1f}% {r['grab_ms']:6.2f}ms")
+        raise SystemExit(0)
+
+    if not args.instances:
+        parser.error("an instances file is required unless --scaling is used")
+    with open(args.instances, 'r') as f:
+        specs = json.load(f)
+    arbiter = MouseArbiter()
+    bots = make_instances(specs, arbiter)
+    supervisor = BotSupervisor(bots, args.fps, arbiter=arbiter).start()
+    print(f"🎣 {len(bots)} instances running, one {supervisor.capture.fps:.0f} FPS shared grab")
+    print(f"   Mouse: shared, instances click in turn (kept {arbiter.lease_s:.1f}s after the last action)")
+    try:
+        deadline = time.perf_counter() + args.duration if args.duration else None
+        while any(thread.is_alive() for thread in supervisor.threads):
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            time.sleep(0.2)
+    except KeyboardInterrupt:
+        print("\n⚠️ Stop requested by user")
+    finally:
+        supervisor.stop()
+        stats = supervisor.stats()
+        for i, instance in enumerate(stats['instances']):
+            mouse = bots[i].input
+            print(f"   #{i}: {instance['tick_rate']:6.1f} ticks/s | {instance['frames']} frames, {instance['skipped']} skipped | "
+                  f"{mouse.turns} mouse turns, {mouse.clicks_sent} clicks")
+        print(f"   Fairness {stats['fairness']:.3f} | grab {stats['grab_ms']:.2f}ms x {stats['frames_captured']} | "
+              f"{arbiter.handoffs} mouse handoffs")
@@ -0,0 +1,133 @@
+import numpy as np
+
+# Table du contrôle proportionnel V4 : premier palier tel que distance > distance min
+V4_DUTY_TABLE = (
+    (150, "long", 128),   # Très très loin : monter vite
+    (100, "fast", 128),   # Loin : monter contrôlé
+    (80, "fast", 128),    # Loin : monter contrôlé
+    (50, "hover", 128),   # Moyennement loin : ralentir progressivement
+    (30, "hover", 40),    # Moyennement loin : ralentir progressivement
+    (1, "stable", 25),    # Approche finale : stabilisation anticipée
+)
+
+def build_duty_table(hover_duty=40, stable_duty=25, band_scale=1.0, base=V4_DUTY_TABLE):
+    """
+    Variante de la table V4 : duty du palier hover (< 100%) et du palier stable,
+    seuils de distance multipliés par band_scale (le dernier palier reste à 1px)
+
+    Sur une table à plusieurs paliers hover / stable, le premier de chaque type
+    prend la valeur demandée et les suivants sont décalés d'autant.
+    """
+    first = {}
+    for _, click_type, duty in base:
+        if (click_type == "hover" and duty < 100) or click_type == "stable":
+            first.setdefault(click_type, duty)
+    shift = {'hover': hover_duty - first.get('hover', hover_duty), 'stable': stable_duty - first.get('stable', stable_duty)}
+    table = []
+    for min_distance, click_type, duty in base:
+        if (click_type == "hover" and duty < 100) or click_type == "stable":
+            duty = min(100, max(0, duty + shift[click_type]))
+        threshold = min_distance if min_distance <= 1 else round(min_distance * band_scale)
+        table.append([threshold, click_type, duty])
+    return table
+
+class AlphaBetaFilter:
+    """Filtre alpha-beta 1D : position et vitesse (px, px/s) à partir de mesures bruitées"""
+    def __init__(self, alpha=0.5, beta=0.1):
+        self.alpha = alpha
+        self.beta = beta
+        self.reset()
+
+    def reset(self):
+        self.position = None
+        self.velocity = 0.0
+        self.last_time = None
+
+    def update(self, measurement, t):
+        if self.position is None:
+            self.position = float(measurement)
+            self.velocity = 0.0
+            self.last_time = t
+            return self.position, self.velocity
+        dt = t - self.last_time
+        if dt <= 0:
+            return self.position, self.velocity
+        predicted = self.position + self.velocity * dt
+        residual = measurement - predicted
+        self.position = predicted + self.alpha * residual
+        self.velocity += self.beta * residual / dt
+        self.last_time = t
+        return self.position, self.velocity
+
+    def predict(self, horizon):
+        """Position projetée horizon secondes après la dernière mesure"""
+        return self.position + self.velocity * horizon
+
+class PredictiveController:
+    """
+    Contrôleur prédictif (alternative à should_click_v4)
+
+    Estime position + vitesse de la zone grise et du marqueur blanc, les projette
+    de la latence mesurée du pipeline (capture -> clic), puis calcule un duty cycle
+    continu : hover_duty + kp * distance + kd * vitesse de la distance.
+    Même format de retour que should_click_v4 : (should_click, click_type, duty_cycle)
+    """
+    def __init__(self, target_offset=40, hover_duty=30.0, kp=1.0, kd=0.15, alpha=0.5, beta=0.1):
+        self.target_offset = target_offset
+        self.hover_duty = hover_duty
+        self.kp = kp
+        self.kd = kd
+        self.gray = AlphaBetaFilter(alpha, beta)
+        self.white = AlphaBetaFilter(alpha, beta)
+
+    def reset(self):
+        self.gray.reset()
+        self.white.reset()
+
+    def update(self, gray_y, white_y, t, latency=0.0):
+        if gray_y is None or white_y is None:
+            return False, None, 0
+        self.gray.update(gray_y, t)
+        self.white.update(white_y, t)
+
+        # Distance projetée au moment où le clic prendra effet (>0 = zone grise trop basse)
+        distance = self.gray.predict(latency) - (self.white.predict(latency) - self.target_offset)
+        closing_speed = self.gray.velocity - self.white.velocity
+        duty_cycle = self.hover_duty + self.kp * distance + self.kd * closing_speed
+        duty_cycle = int(round(min(100.0, max(0.0, duty_cycle))))
+
+        if duty_cycle <= 0:
+            return False, None, 0
+        if duty_cycle >= 100:
+            return True, "long", 100
+        return True, "pwm", duty_cycle
+
+class TrackingStats:
+    """Erreur de suivi (distance à la cible, px) et durée des mini-jeux d'un contrôleur"""
+    def __init__(self, tolerance=5, max_samples=100000):
+        self.tolerance = tolerance
+        # Anneau préalloué : add_error (appelé à chaque tick) n'alloue rien
+        self.errors = np.zeros(max_samples, np.float64)
+        self.error_count = 0
+        self.durations = []
+
+    def add_error(self, distance):
+        self.errors[self.error_count % len(self.errors)] = distance
+        self.error_count += 1
+
+    def add_minigame(self, duration):
+        self.durations.append(duration)
+
+    def summary(self):
+        samples = min(self.error_count, len(self.errors))
+        errors = np.abs(self.errors[:samples]) if samples else np.zeros(1)
+        durations = np.array(self.durations, np.float64) if self.durations else np.zeros(1)
+        return {
+            'samples': samples,
+            'mean_abs_error': float(errors.mean()),
+            'rms_error': float(np.sqrt((errors ** 2).mean())),
+            'p95_abs_error': float(np.percentile(errors, 95)),
+            'in_tolerance': float((errors <= self.tolerance).mean()),
+            'minigames': len(self.durations),
+            'mean_minigame_s': float(durations.mean()),
+        }
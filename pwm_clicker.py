@@ -0,0 +1,133 @@
+import threading
+import time
+from collections import deque
+import numpy as np
+from timing import SPIN_THRESHOLD
+
+class PWMClicker:
+    """
+    Actionneur PWM : génère les fronts mouseDown/mouseUp sur son propre timer
+
+    La boucle de la bot envoie seulement des commandes (duty_cycle, period) ;
+    les fronts tombent à l'heure quel que soit le FPS de la boucle de capture.
+    duty_cycle en % : <= 0 relâché en continu, >= 100 maintenu en continu.
+    """
+    def __init__(self, input_device, period=0.1, spin=SPIN_THRESHOLD):
+        self.input = input_device
+        self.period = period
+        self.duty_cycle = 0
+        self.spin = spin
+        self.clock = time.perf_counter
+        self.lock = threading.Lock()
+        self.changed = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.pressed = False
+        self.reset_stats()
+
+    def reset_stats(self):
+        now = self.clock()
+        self.stats_start = now
+        self.last_command_time = now
+        self.requested_on_time = 0.0
+        self.pressed_time = 0.0
+        self.pressed_since = now if self.pressed else None
+        self.edge_errors = deque(maxlen=1000)
+
+    def set_command(self, duty_cycle, period=None):
+        """Nouvelle consigne (thread-safe), appliquée au prochain front"""
+        duty_cycle = max(0, min(100, duty_cycle))
+        period = self.period if period is None else period
+        with self.lock:
+            if duty_cycle == self.duty_cycle and period == self.period:
+                return
+            now = self.clock()
+            self.requested_on_time += (now - self.last_command_time) * self.duty_cycle / 100.0
+            self.last_command_time = now
+            self.duty_cycle = duty_cycle
+            self.period = period
+        self.changed.set()
+
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.changed.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        self._set_pressed(False, self.clock())
+
+    def _set_pressed(self, pressed, scheduled):
+        if pressed == self.pressed:
+            return
+        if pressed:
+            self.input.mouseDown()
+        else:
+            self.input.mouseUp()
+        now = self.clock()
+        self.edge_errors.append(now - scheduled)
+        if pressed:
+            self.pressed_since = now
+        elif self.pressed_since is not None:
+            self.pressed_time += now - self.pressed_since
+            self.pressed_since = None
+        self.pressed = pressed
+
+    def _wait_until(self, deadline):
+        """Attente hybride interruptible : retourne True si la consigne a changé"""
+        remaining = deadline - self.clock()
+        if remaining > self.spin and self.changed.wait(remaining - self.spin):
+            return True
+        while self.clock() < deadline:
+            if self.changed.is_set():
+                return True
+        return False
+
+    def _loop(self):
+        period_start = self.clock()
+        while not self.stop_event.is_set():
+            self.changed.clear()
+            with self.lock:
+                duty_cycle, period = self.duty_cycle, self.period
+            now = self.clock()
+
+            if duty_cycle <= 0 or duty_cycle >= 100:
+                self._set_pressed(duty_cycle >= 100, now)
+                self.changed.wait(0.1)
+                period_start = self.clock()
+                continue
+
+            release_at = period_start + period * duty_cycle / 100.0
+            next_start = period_start + period
+            if now < release_at:
+                self._set_pressed(True, period_start)
+                if self._wait_until(release_at):
+                    continue
+            self._set_pressed(False, release_at)
+            if self._wait_until(next_start):
+                continue
+            period_start = next_start
+            # En retard d'une période entière (machine chargée) : on se recale
+            if self.clock() - period_start > period:
+                period_start = self.clock()
+
+    def stats(self):
+        """Duty demandé vs obtenu (%) et jitter des fronts (ms) depuis reset_stats()"""
+        with self.lock:
+            now = self.clock()
+            elapsed = now - self.stats_start
+            requested = self.requested_on_time + (now - self.last_command_time) * self.duty_cycle / 100.0
+        pressed = self.pressed_time + (now - self.pressed_since if self.pressed_since is not None else 0.0)
+        errors = np.abs(np.array(self.edge_errors)) * 1000 if self.edge_errors else np.zeros(1)
+        return {
+            'requested_duty': requested / elapsed * 100 if elapsed > 0 else 0.0,
+            'achieved_duty': pressed / elapsed * 100 if elapsed > 0 else 0.0,
+            'jitter_p50_ms': float(np.percentile(errors, 50)),
+            'jitter_p99_ms': float(np.percentile(errors, 99)),
+            'jitter_max_ms': float(errors.max()),
+            'edges': len(self.edge_errors),
+        }
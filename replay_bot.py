@@ -0,0 +1,28 @@
+import sys
+import time
+from fishing_bot import GPOFishingBot
+from frame_source import ReplayFrameSource
+from bot_input import RecordingInput
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python replay_bot.py <recording_dir|session.npz> [--realtime]")
+        raise SystemExit(1)
+
+    source = ReplayFrameSource(sys.argv[1], realtime='--realtime' in sys.argv)
+    bot = GPOFishingBot()
+    bot.frame_source = source
+    bot.input = RecordingInput(clock=source.clock)
+    bot.start_delay = 0
+    bot.persist_stats = False
+    bot.flight_recording = False
+
+    start = time.perf_counter()
+    bot.run()
+    elapsed = time.perf_counter() - start
+
+    frames = source.index
+    recorded = source.timestamps[-1] - source.timestamps[0] if len(source) > 1 else 0.0
+    print(f"\n📼 Replayed {frames} frames in {elapsed:.3f}s ({frames / elapsed:.0f} ticks/s)")
+    print(f"   Recorded duration: {recorded:.1f}s (x{recorded / elapsed:.1f} real time)")
+    print(f"   Input events: {len(bot.input.events)} | Fish caught: {bot.fish_count}")
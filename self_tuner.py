@@ -0,0 +1,216 @@
+import json
+import os
+import queue
+import threading
+import time
+import numpy as np
+from predictive_control import build_duty_table
+
+# Paramètres réglés en ligne : (min, max, pas). Bornes = plage sûre, jamais dépassée
+TUNABLE = {
+    'target_offset': (25, 60, 3),     # px : zone grise au-dessus du marqueur
+    'band_scale': (0.7, 1.4, 0.1),    # échelle des seuils de distance de la table V4
+    'hover_duty': (20, 80, 5),        # % : palier hover (approche moyenne)
+    'stable_duty': (10, 50, 5),       # % : palier stable (approche finale)
+}
+
+DEFAULT_TUNING = {'target_offset': 40, 'band_scale': 1.0, 'hover_duty': 40, 'stable_duty': 25}
+
+# Paramètres qui agissent sur chaque contrôleur (la table de duty n'est utilisée que par V4)
+CONTROLLER_PARAMS = {'v4': tuple(TUNABLE), 'predictive': ('target_offset',)}
+
+# Lecture-modification-écriture du fichier partagé par tous les tuners du processus (multi_bot)
+WRITE_LOCK = threading.Lock()
+
+def table_params(table):
+    """Duty des paliers hover (< 100%) et stable d'une table : réglages de départ qui la reproduisent"""
+    params = {}
+    for _, click_type, duty in table:
+        if click_type == "hover" and duty < 100:
+            params.setdefault('hover_duty', duty)
+        elif click_type == "stable":
+            params.setdefault('stable_duty', duty)
+    return params
+
+class OnlineTuner:
+    """
+    Réglage en ligne de target_offset et de la table de duty cycle V4
+
+    Montée de gradient paramètre par paramètre sur le temps de capture, en
+    fenêtres A/B alternées : `window` mini-jeux avec les réglages courants
+    donnent la référence (A), puis un pas (±pas d'un paramètre, dans ses
+    bornes) est essayé sur `window` mini-jeux (B). Gardé si B réduit le score
+    moyen d'au moins min_gain par rapport à A et d'au moins `confidence`
+    écarts-types de la différence des moyennes (variance des temps de capture),
+    sinon annulé et on essaie la direction opposée puis le paramètre suivant.
+    La référence est re-mesurée avant chaque pas : une fenêtre chanceuse ne
+    reste pas la référence.
+    Seuls les paramètres du contrôleur actif sont réglés (CONTROLLER_PARAMS).
+    Score d'un mini-jeu = durée si poisson attrapé, sinon durée + lost_penalty.
+
+    La table de duty n'est reconstruite que si ses paramètres sont réglés
+    (contrôleur V4), à partir de la table du bot au démarrage : une table
+    personnalisée garde ses paliers, et est remise en place par close().
+
+    Réglages appris persistés par profil de calibration (fichier de
+    calibration) dans `path` par un thread dédié (comme SessionStore) : la
+    boucle ne fait qu'un put_nowait ; chaque ajustement est affiché et historisé.
+    """
+    def __init__(self, bot, path='tuning.json', window=5, min_gain=0.03, confidence=1.0, lost_penalty=30.0, max_log=200):
+        self.bot = bot
+        self.path = path
+        self.window = window
+        self.min_gain = min_gain
+        self.confidence = confidence
+        self.lost_penalty = lost_penalty
+        self.max_log = max_log
+        self.profile = os.path.basename(bot.calibration_path)
+        self.base_table = [list(row) for row in bot.duty_table]
+        self.params = dict(DEFAULT_TUNING, target_offset=bot.target_offset, **table_params(self.base_table))
+        self.baseline = None
+        self.baseline_var = 0.0    # Variance de la moyenne de la fenêtre de référence
+        self.trial = None          # (nom, ancienne valeur) du pas en cours d'essai
+        self.direction = 1
+        self.order = list(CONTROLLER_PARAMS.get(bot.controller, TUNABLE))
+        self.param_index = 0
+        self.tried_opposite = False
+        self.scores = []
+        self.errors = []
+        self.log = []
+        self.queue = queue.Queue(maxsize=100)
+        self.thread = None
+
+    def load(self):
+        """Applique les réglages déjà appris pour ce profil (sinon les réglages actuels du bot) et démarre l'écriture"""
+        profiles = self.read_profiles()
+        saved = profiles.get(self.profile)
+        if saved:
+            for name, value in saved['params'].items():
+                if name in TUNABLE:
+                    low, high, _ = TUNABLE[name]
+                    self.params[name] = min(high, max(low, value))
+            self.log = saved.get('log', [])
+            print(f"🎛️ Tuning loaded for {self.profile}: {self.describe()}")
+        self.apply()
+        self.thread = threading.Thread(target=self._writer, daemon=True)
+        self.thread.start()
+        return self
+
+    def close(self):
+        """Vide la queue, arrête le thread d'écriture et remet la table de duty d'origine"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join(timeout=5.0)
+            self.thread = None
+        self.bot.duty_table = self.base_table
+
+    def read_profiles(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Failed to load tuning: {e}")
+            return {}
+
+    def save(self):
+        """Copie du profil envoyée au thread d'écriture (pas d'I/O dans la boucle)"""
+        entry = {'params': dict(self.params), 'baseline_s': self.baseline,
+                 'updated': time.time(), 'log': self.log[-self.max_log:]}
+        try:
+            self.queue.put_nowait(entry)
+        except queue.Full:
+            print("⚠️ Tuning queue full, save dropped")
+
+    def _writer(self):
+        while True:
+            entry = self.queue.get()
+            if entry is None:
+                return
+            with WRITE_LOCK:
+                profiles = self.read_profiles()
+                profiles[self.profile] = entry
+                try:
+                    with open(self.path, 'w') as f:
+                        json.dump(profiles, f, indent=2)
+                except Exception as e:
+                    print(f"⚠️ Failed to save tuning: {e}")
+
+    def apply(self):
+        p = self.params
+        self.bot.target_offset = p['target_offset']
+        if 'hover_duty' in self.order:
+            self.bot.duty_table = build_duty_table(p['hover_duty'], p['stable_duty'], p['band_scale'], base=self.base_table)
+
+    def describe(self):
+        p = self.params
+        return (f"offset {p['target_offset']}px | bands x{p['band_scale']:.1f} | "
+                f"hover {p['hover_duty']}% | stable {p['stable_duty']}%")
+
+    def on_minigame(self, duration, caught, mean_error):
+        """Fin d'un mini-jeu : score enregistré, décision à chaque fenêtre complète"""
+        self.scores.append(duration + (0.0 if caught else self.lost_penalty))
+        self.errors.append(mean_error)
+        if len(self.scores) < self.window:
+            return
+        score = float(np.mean(self.scores))
+        score_var = float(np.var(self.scores, ddof=1)) / len(self.scores) if len(self.scores) > 1 else 0.0
+        error = float(np.mean(self.errors))
+        self.scores, self.errors = [], []
+
+        if self.trial is None:
+            # Fenêtre A : référence des réglages courants, puis essai d'un pas
+            self.baseline = score
+            self.baseline_var = score_var
+            self.start_trial()
+            return
+        name, previous = self.trial
+        self.trial = None
+        noise = self.confidence * np.sqrt(self.baseline_var + score_var)
+        if self.baseline - score > max(self.min_gain * self.baseline, noise):
+            self.record(name, previous, self.params[name], score, error, "accepted")
+            # Même direction tant que ça s'améliore (la direction opposée ramène au réglage moins bon)
+            self.tried_opposite = True
+        else:
+            self.record(name, self.params[name], previous, score, error, "reverted")
+            self.params[name] = previous
+            self.apply()
+            if self.tried_opposite:
+                self.next_param()
+            else:
+                self.direction = -self.direction
+                self.tried_opposite = True
+        # Pas de nouvel essai tout de suite : la fenêtre suivante re-mesure la référence
+        self.save()
+
+    def next_param(self):
+        self.param_index = (self.param_index + 1) % len(self.order)
+        self.direction = 1
+        self.tried_opposite = False
+
+    def start_trial(self):
+        """Essaie le pas suivant ; paramètres en butée sautés"""
+        for _ in range(2 * len(self.order)):
+            name = self.order[self.param_index]
+            low, high, step = TUNABLE[name]
+            value = round(self.params[name] + self.direction * step, 3)
+            if low <= value <= high:
+                self.trial = (name, self.params[name])
+                self.params[name] = value
+                self.apply()
+                print(f"🎛️ Tuning trial: {name} {self.trial[1]} -> {value} (baseline {self.baseline:.1f}s)")
+                return
+            if self.tried_opposite:
+                self.next_param()
+            else:
+                self.direction = -self.direction
+                self.tried_opposite = True
+
+    def record(self, name, old, new, score, error, decision):
+        """Historise un ajustement (pas gardé ou annulé)"""
+        entry = {'timestamp': time.time(), 'param': name, 'from': old, 'to': new, 'decision': decision,
+                 'score_s': score, 'baseline_s': self.baseline, 'mean_abs_error': error}
+        self.log.append(entry)
+        print(f"🎛️ Tuning {decision}: {name} {old} -> {new} | score {score:.1f}s vs {self.baseline:.1f}s | "
+              f"|err| {error:.1f}px")
@@ -0,0 +1,131 @@
+import json
+import os
+import queue
+import sys
+import threading
+import time
+import numpy as np
+
+class SessionStore:
+    """
+    Statistiques de pêche en append-only (JSONL), écrites par un thread dédié
+
+    La boucle de la bot ne fait qu'un put_nowait dans une queue : aucune I/O
+    fichier dans le hot path. Un enregistrement par cycle de pêche :
+    session, timestamp, cast_s (attente avant relance), bite_s (lancer -> touche),
+    minigame_s, cycle_s et outcome ("caught" ou "timeout" ; "lost" dans les
+    anciens fichiers).
+    """
+    def __init__(self, path='sessions.jsonl', count_path='fish_count.json'):
+        self.path = path
+        self.count_path = count_path
+        self.session = time.strftime("%Y%m%d_%H%M%S")
+        self.queue = queue.Queue(maxsize=10000)
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._writer, daemon=True)
+        self.thread.start()
+        return self
+
+    def close(self):
+        """Vide la queue puis arrête le thread d'écriture"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join(timeout=5.0)
+            self.thread = None
+
+    def record_catch(self, cast_s, bite_s, minigame_s, outcome):
+        cycle_s = sum(v for v in (cast_s, bite_s, minigame_s) if v is not None)
+        self._submit(('catch', {'session': self.session, 'timestamp': time.time(), 'cast_s': cast_s,
+                                'bite_s': bite_s, 'minigame_s': minigame_s, 'cycle_s': cycle_s,
+                                'outcome': outcome}))
+
+    def save_count(self, count):
+        self._submit(('count', count))
+
+    def _submit(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            print("⚠️ Session store queue full, record dropped")
+
+    def _writer(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            kind, payload = item
+            try:
+                if kind == 'catch':
+                    with open(self.path, 'a') as f:
+                        f.write(json.dumps(payload) + "\n")
+                else:
+                    with open(self.count_path, 'w') as f:
+                        json.dump({'count': payload}, f)
+            except Exception as e:
+                print(f"⚠️ Failed to save stats: {e}")
+
+def load_records(path='sessions.jsonl', session=None):
+    """Enregistrements du fichier (optionnellement filtrés sur une session)"""
+    records = []
+    if not os.path.exists(path):
+        return records
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if session is None or record['session'] == session:
+                records.append(record)
+    return records
+
+def fish_per_hour(records):
+    """Poissons par heure de pêche active (somme des durées de cycle)"""
+    active = sum(r['cycle_s'] for r in records)
+    caught = sum(1 for r in records if r['outcome'] == 'caught')
+    return caught / active * 3600 if active > 0 else 0.0
+
+def cycle_time_percentiles(records, percentiles=(50, 90, 99), key='cycle_s'):
+    """Percentiles d'une durée (cycle_s, cast_s, bite_s, minigame_s) sur les poissons attrapés"""
+    values = [r[key] for r in records if r['outcome'] == 'caught' and r.get(key) is not None]
+    if not values:
+        return {}
+    return {p: float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))}
+
+def session_summaries(records):
+    """Résumé par session : poissons, perdus, timeouts, poissons/heure, médiane du cycle"""
+    sessions = {}
+    for record in records:
+        sessions.setdefault(record['session'], []).append(record)
+    summaries = {}
+    for session, items in sessions.items():
+        cycle = cycle_time_percentiles(items, (50,))
+        summaries[session] = {
+            'caught': sum(1 for r in items if r['outcome'] == 'caught'),
+            'lost': sum(1 for r in items if r['outcome'] == 'lost'),
+            'timeouts': sum(1 for r in items if r['outcome'] == 'timeout'),
+            'fish_per_hour': fish_per_hour(items),
+            'cycle_p50_s': cycle.get(50),
+        }
+    return summaries
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else 'sessions.jsonl'
+    records = load_records(path)
+    if not records:
+        print(f"❌ No records in {path}")
+        raise SystemExit(1)
+
+    print(f"\n{'Session':<16} {'Fish':>6} {'Lost':>5} {'Timeouts':>9} {'Fish/h':>8} {'Cycle p50':>10}")
+    print("-" * 59)
+    for session, summary in session_summaries(records).items():
+        p50 = f"{summary['cycle_p50_s']:.1f}s" if summary['cycle_p50_s'] is not None else "--"
+        print(f"{session:<16} {summary['caught']:6d} {summary['lost']:5d} {summary['timeouts']:9d} {summary['fish_per_hour']:8.1f} {p50:>10}")
+
+    print(f"\nAll sessions: {fish_per_hour(records):.1f} fish/h")
+    for key in ('cycle_s', 'cast_s', 'bite_s', 'minigame_s'):
+        stats = cycle_time_percentiles(records, key=key)
+        if stats:
+            print(f"  {key:<11} " + " | ".join(f"p{p} {v:5.1f}s" for p, v in stats.items()))
@@ -0,0 +1,49 @@
+from collections import deque
+
+class TelemetryChannel:
+    """
+    Canal bot -> GUI, sans lock
+
+    Les stats live sont écrites en place dans deux dicts préalloués (double
+    buffer) : le thread de la bot remplit celui que next_stats() lui donne puis
+    le publie avec commit_stats(), sans aucune allocation dans la boucle. Le
+    GUI n'affiche que le plus récent : drain() en renvoie une copie s'il a
+    changé depuis le dernier appel.
+    Les messages de contrôle ("status", "stopped", ...) sont rares et ne
+    doivent pas se perdre : append sur une deque non bornée (atomique sous le
+    GIL, jamais bloquant). Le thread Tk vide le canal à son rythme avec drain().
+    """
+    def __init__(self):
+        self.control = deque()
+        self.stats = ({'type': 'stats', 'stages_ms': {}}, {'type': 'stats', 'stages_ms': {}})
+        self.stats_front = 0
+        self.stats_seq = 0
+        self.stats_read = 0
+
+    def publish(self, message):
+        self.control.append(message)
+
+    def next_stats(self):
+        """Buffer de stats à remplir (celui qui n'est pas publié), valeurs du snapshot précédent"""
+        return self.stats[self.stats_front ^ 1]
+
+    def commit_stats(self):
+        # Bascule du buffer publié puis numéro de version : drain() ne lit que le buffer complet
+        self.stats_front ^= 1
+        self.stats_seq += 1
+
+    def drain(self):
+        """Messages de contrôle du plus ancien au plus récent, puis copie des dernières stats si nouvelles"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.control.popleft())
+            except IndexError:
+                break
+        seq = self.stats_seq
+        if seq != self.stats_read:
+            self.stats_read = seq
+            stats = dict(self.stats[self.stats_front])
+            stats['stages_ms'] = dict(stats['stages_ms'])
+            messages.append(stats)
+        return messages
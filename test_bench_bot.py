@@ -0,0 +1,7 @@
+from bench_bot import check_allocations
+
+def test_steady_state_tick_allocates_no_buffer():
+    # Télémétrie GUI, trace et boîte noire comprises : aucun tick au-dessus de la limite
+    result = check_allocations(ticks=3000, warmup=500)
+    assert result['peak_max_bytes'] <= result['limit_bytes'], result
+    assert result['growth_bytes'] <= result['growth_limit_bytes'], result
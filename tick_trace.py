@@ -0,0 +1,132 @@
+import csv
+import json
+import threading
+import time
+import numpy as np
+
+STAGES = ('grab', 'convert', 'blue_detect', 'green_progress', 'controller', 'input')
+
+class TickTracer:
+    """
+    Instrumentation par étape de chaque tick de GPOFishingBot.run
+
+    Anneau préalloué des N derniers ticks (durées par étape) : coût par tick =
+    quelques perf_counter + une écriture de ligne. Les percentiles / histogrammes
+    glissants et les exports CSV / Chrome trace sont calculés à la demande.
+    """
+    def __init__(self, capacity=10000, stages=STAGES):
+        self.stages = stages
+        self.index = {name: i for i, name in enumerate(stages)}
+        self.capacity = capacity
+        self.durations = np.zeros((capacity, len(stages)), np.float64)
+        self.starts = np.zeros(capacity, np.float64)
+        self.count = 0
+        # Tick en cours hors de l'anneau : un tick jamais validé n'écrase pas le plus ancien
+        self.row = np.zeros(len(stages), np.float64)
+        # Résultats de recent_means (réécrits à chaque appel, aucune allocation)
+        self.means = np.zeros(len(stages) + 1, np.float64)
+        self.tail_sum = np.zeros(len(stages), np.float64)
+        self.tick_start = 0.0
+        self.last = 0.0
+        self.lock = threading.Lock()
+        self.clock = time.perf_counter
+
+    def begin_tick(self):
+        self.row[:] = 0.0
+        self.tick_start = self.last = self.clock()
+
+    def mark(self, stage):
+        """Attribue le temps écoulé depuis la marque précédente à stage"""
+        now = self.clock()
+        self.row[self.index[stage]] += now - self.last
+        self.last = now
+
+    def end_tick(self):
+        # Copie de la ligne et compteur sous le lock (lecture cohérente lors d'un dump)
+        with self.lock:
+            self.durations[self.count % self.capacity] = self.row
+            self.starts[self.count % self.capacity] = self.tick_start
+            self.count += 1
+
+    def snapshot(self):
+        """Copie chronologique (starts, durations) des ticks encore dans l'anneau"""
+        with self.lock:
+            n = min(self.count, self.capacity)
+            order = (np.arange(self.count - n, self.count)) % self.capacity
+            return self.starts[order].copy(), self.durations[order].copy()
+
+    def recent_means(self, last):
+        """
+        Durée moyenne (ms) par étape puis du tick complet sur les `last` derniers
+        ticks, dans self.means (réécrit à chaque appel) ; None si aucun tick
+
+        Sommes en place sur les (au plus deux) tranches de l'anneau : appelable
+        depuis la boucle sans allouer de buffer.
+        """
+        stages = self.means[:-1]
+        with self.lock:
+            n = min(last, self.count, self.capacity)
+            if n == 0:
+                return None
+            end = self.count % self.capacity
+            if end >= n:
+                np.sum(self.durations[end - n:end], axis=0, out=stages)
+            else:
+                np.sum(self.durations[end - n:], axis=0, out=stages)
+                np.sum(self.durations[:end], axis=0, out=self.tail_sum)
+                stages += self.tail_sum
+        stages *= 1000.0 / n
+        self.means[-1] = stages.sum()
+        return self.means
+
+    def summary(self, last=None):
+        """p50/p95/p99/max (ms) par étape et pour le tick complet, sur les `last` derniers ticks"""
+        _, durations = self.snapshot()
+        if last is not None:
+            durations = durations[-last:]
+        if len(durations) == 0:
+            return {}
+        durations = np.column_stack([durations, durations.sum(axis=1)]) * 1000
+        p50, p95, p99 = np.percentile(durations, [50, 95, 99], axis=0)
+        peak = durations.max(axis=0)
+        return {name: {'p50_ms': float(p50[i]), 'p95_ms': float(p95[i]),
+                       'p99_ms': float(p99[i]), 'max_ms': float(peak[i])}
+                for i, name in enumerate(self.stages + ('tick',))}
+
+    def histogram(self, stage, bins=None):
+        """Histogramme glissant (échelle log, µs) d'une étape : (bornes, effectifs)"""
+        if bins is None:
+            bins = np.logspace(0, 5, 26)  # 1 µs -> 100 ms
+        _, durations = self.snapshot()
+        counts, edges = np.histogram(durations[:, self.index[stage]] * 1e6, bins=bins)
+        return edges, counts
+
+    def dump(self, path):
+        """Exporte la trace : .csv (une ligne par tick) ou .json (format Chrome trace)"""
+        starts, durations = self.snapshot()
+        if path.endswith('.csv'):
+            self._dump_csv(path, starts, durations)
+        else:
+            self._dump_chrome_trace(path, starts, durations)
+        print(f"💾 Trace saved: {len(starts)} ticks -> {path}")
+
+    def _dump_csv(self, path, starts, durations):
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['tick_start_s'] + [f'{name}_us' for name in self.stages] + ['tick_us'])
+            for start, row in zip(starts, durations * 1e6):
+                writer.writerow([f'{start:.6f}'] + [f'{v:.1f}' for v in row] + [f'{row.sum():.1f}'])
+
+    def _dump_chrome_trace(self, path, starts, durations):
+        # Les étapes d'un tick sont enchaînées dans l'ordre de STAGES
+        events = []
+        origin = starts[0] if len(starts) else 0.0
+        for start, row in zip(starts, durations):
+            ts = (start - origin) * 1e6
+            events.append({'name': 'tick', 'ph': 'X', 'pid': 1, 'tid': 1, 'ts': ts, 'dur': row.sum() * 1e6})
+            for name, duration in zip(self.stages, row):
+                if duration > 0:
+                    events.append({'name': name, 'ph': 'X', 'pid': 1, 'tid': 2, 'ts': ts, 'dur': duration * 1e6})
+                    ts += duration * 1e6
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
@@ -0,0 +1,17 @@
+import time
+
+# En dessous de ce délai on boucle activement : time.sleep n'est pas assez précis
+SPIN_THRESHOLD = 0.002
+
+def sleep_until(deadline, spin=SPIN_THRESHOLD, clock=time.perf_counter):
+    """
+    Attente hybride jusqu'à deadline (horloge monotone)
+
+    time.sleep pour le gros de l'attente, puis boucle active sur les
+    dernières millisecondes pour tomber pile sur l'échéance.
+    """
+    remaining = deadline - clock()
+    if remaining > spin:
+        time.sleep(remaining - spin)
+    while clock() < deadline:
+        pass
@@ -0,0 +1,197 @@
+import ctypes
+import ctypes.util
+import os
+import sys
+import numpy as np
+
+ZPIXMAP = 2
+ALL_PLANES = 0xFFFFFFFF
+IPC_PRIVATE = 0
+IPC_CREAT = 0o1000
+IPC_RMID = 0
+
+class XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [('shmseg', ctypes.c_ulong), ('shmid', ctypes.c_int),
+                ('shmaddr', ctypes.c_void_p), ('readOnly', ctypes.c_int)]
+
+class XImage(ctypes.Structure):
+    # Début de la structure Xlib seulement (champs lus ici)
+    _fields_ = [('width', ctypes.c_int), ('height', ctypes.c_int), ('xoffset', ctypes.c_int),
+                ('format', ctypes.c_int), ('data', ctypes.c_void_p), ('byte_order', ctypes.c_int),
+                ('bitmap_unit', ctypes.c_int), ('bitmap_bit_order', ctypes.c_int), ('bitmap_pad', ctypes.c_int),
+                ('depth', ctypes.c_int), ('bytes_per_line', ctypes.c_int), ('bits_per_pixel', ctypes.c_int)]
+
+X_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+def load_libraries():
+    """libX11, libXext et libc via ctypes ; OSError si absentes"""
+    names = [ctypes.util.find_library(name) for name in ('X11', 'Xext', 'c')]
+    if not all(names):
+        raise OSError("libX11 / libXext not found")
+    x11, xext, libc = (ctypes.CDLL(name) for name in names)
+
+    x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    x11.XOpenDisplay.restype = ctypes.c_void_p
+    x11.XDefaultScreen.argtypes = [ctypes.c_void_p]
+    x11.XRootWindow.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    x11.XRootWindow.restype = ctypes.c_ulong
+    x11.XDefaultVisual.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    x11.XDefaultVisual.restype = ctypes.c_void_p
+    x11.XDefaultDepth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    x11.XDisplayWidth.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    x11.XDisplayHeight.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    x11.XSync.argtypes = [ctypes.c_void_p, ctypes.c_int]
+    x11.XFree.argtypes = [ctypes.c_void_p]
+    x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+    x11.XSetErrorHandler.argtypes = [X_ERROR_HANDLER]
+    x11.XSetErrorHandler.restype = ctypes.c_void_p
+
+    xext.XShmQueryExtension.argtypes = [ctypes.c_void_p]
+    xext.XShmCreateImage.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_char_p,
+                                     ctypes.POINTER(XShmSegmentInfo), ctypes.c_uint, ctypes.c_uint]
+    xext.XShmCreateImage.restype = ctypes.POINTER(XImage)
+    xext.XShmAttach.argtypes = [ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo)]
+    xext.XShmDetach.argtypes = [ctypes.c_void_p, ctypes.POINTER(XShmSegmentInfo)]
+    xext.XShmGetImage.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(XImage),
+                                  ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+
+    libc.shmget.argtypes = [ctypes.c_int, ctypes.c_size_t, ctypes.c_int]
+    libc.shmat.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_int]
+    libc.shmat.restype = ctypes.c_void_p
+    libc.shmdt.argtypes = [ctypes.c_void_p]
+    libc.shmctl.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_void_p]
+    return x11, xext, libc
+
+# Erreurs X asynchrones (ex. XShmAttach refusé sur un display distant) : le handler
+# Xlib par défaut termine le process, celui-ci les compte pour basculer sur mss
+x_errors = []
+
+@X_ERROR_HANDLER
+def record_x_error(display, event):
+    x_errors.append(event)
+    return 0
+
+class XShmImage:
+    """Segment de mémoire partagée d'une taille de région, mappé une fois en ndarray BGRA"""
+    def __init__(self, grabber, width, height):
+        self.grabber = grabber
+        x11, xext, libc = grabber.x11, grabber.xext, grabber.libc
+        self.info = XShmSegmentInfo()
+        self.image = xext.XShmCreateImage(grabber.display, grabber.visual, grabber.depth, ZPIXMAP, None,
+                                          ctypes.byref(self.info), width, height)
+        if not self.image:
+            raise OSError("XShmCreateImage failed")
+        image = self.image.contents
+        if image.bits_per_pixel != 32:
+            x11.XFree(self.image)
+            raise OSError(f"Unsupported pixel format: {image.bits_per_pixel} bpp")
+
+        size = image.bytes_per_line * height
+        self.info.shmid = libc.shmget(IPC_PRIVATE, size, IPC_CREAT | 0o600)
+        if self.info.shmid < 0:
+            x11.XFree(self.image)
+            raise OSError("shmget failed")
+        address = libc.shmat(self.info.shmid, None, 0)
+        if address in (None, ctypes.c_void_p(-1).value):
+            libc.shmctl(self.info.shmid, IPC_RMID, None)
+            x11.XFree(self.image)
+            raise OSError("shmat failed")
+        self.info.shmaddr = address
+        self.info.readOnly = 0
+        image.data = address
+
+        del x_errors[:]
+        attached = xext.XShmAttach(grabber.display, ctypes.byref(self.info))
+        x11.XSync(grabber.display, 0)
+        # Segment détruit automatiquement au dernier détachement (même si le process est tué)
+        libc.shmctl(self.info.shmid, IPC_RMID, None)
+        if not attached or x_errors:
+            libc.shmdt(ctypes.c_void_p(address))
+            x11.XFree(self.image)
+            raise OSError("XShmAttach failed (display not local?)")
+
+        buffer = (ctypes.c_ubyte * size).from_address(address)
+        self.frame = np.ndarray((height, width, 4), np.uint8, buffer, strides=(image.bytes_per_line, 4, 1))
+
+    def close(self):
+        grabber = self.grabber
+        grabber.xext.XShmDetach(grabber.display, ctypes.byref(self.info))
+        grabber.x11.XSync(grabber.display, 0)
+        self.frame = None
+        grabber.libc.shmdt(ctypes.c_void_p(self.info.shmaddr))
+        # data pointe sur le segment : XFree de la structure seule (pas XDestroyImage)
+        grabber.x11.XFree(self.image)
+
+class XShmGrabber:
+    """
+    Capture X11 zéro-copie via MIT-SHM, même interface que mss.mss() pour le bot
+
+    grab(region) fait un XShmGetImage dans un segment partagé alloué une fois
+    par taille de région et retourne directement la vue NumPy BGRA de ce
+    segment : aucune allocation ni copie par grab. La vue est réécrite au
+    grab suivant de même taille (capture_bars convertit immédiatement, donc
+    sans risque) ; copier pour conserver une frame.
+    Lié au thread qui l'a créé, comme mss.
+    """
+    def __init__(self, display=None):
+        self.x11, self.xext, self.libc = load_libraries()
+        name = display if display is not None else os.environ.get('DISPLAY')
+        if not name:
+            raise OSError("DISPLAY not set")
+        self.display = self.x11.XOpenDisplay(name.encode())
+        if not self.display:
+            raise OSError(f"Cannot open display {name}")
+        self.x11.XSetErrorHandler(record_x_error)
+        if not self.xext.XShmQueryExtension(self.display):
+            self.x11.XCloseDisplay(self.display)
+            raise OSError("MIT-SHM extension not available")
+        screen = self.x11.XDefaultScreen(self.display)
+        self.root = self.x11.XRootWindow(self.display, screen)
+        self.visual = self.x11.XDefaultVisual(self.display, screen)
+        self.depth = self.x11.XDefaultDepth(self.display, screen)
+        full = {"top": 0, "left": 0, "width": self.x11.XDisplayWidth(self.display, screen),
+                "height": self.x11.XDisplayHeight(self.display, screen)}
+        self.monitors = [full, dict(full)]
+        self.images = {}
+
+    def grab(self, region):
+        key = (region['width'], region['height'])
+        image = self.images.get(key)
+        if image is None:
+            image = self.images[key] = XShmImage(self, *key)
+        if not self.xext.XShmGetImage(self.display, self.root, image.image, region['left'], region['top'], ALL_PLANES):
+            raise OSError(f"XShmGetImage failed for {region}")
+        return image.frame
+
+    def close(self):
+        for image in self.images.values():
+            image.close()
+        self.images = {}
+        if self.display:
+            self.x11.XCloseDisplay(self.display)
+            self.display = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_capture(backend="auto"):
+    """
+    Objet de capture du thread courant : XShmGrabber ou mss.mss()
+
+    backend : "auto" (XShm sous Linux/X11, sinon repli sur mss), "xshm" (erreur
+    si indisponible) ou "mss".
+    """
+    if backend in ("auto", "xshm") and sys.platform.startswith('linux'):
+        try:
+            return XShmGrabber()
+        except OSError as e:
+            if backend == "xshm":
+                raise
+            print(f"⚠️ XShm capture unavailable ({e}), using mss")
+    elif backend == "xshm":
+        raise OSError("XShm capture is only available on Linux/X11")
+    import mss
+    return mss.mss()